@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import json
 from datetime import datetime
+from styles.professional_styles import apply_extended_styles
 
 def render_agent_review_page():
     """
@@ -13,6 +14,8 @@ def render_agent_review_page():
     Interface for agents to review recommendations, adjust weights, and add insights
     """
 
+    apply_extended_styles()
+
     st.title("👨‍💼 Agent Review & Notes")
     st.subheader("Review Recommendations & Add Professional Insights")
 
@@ -6,10 +6,13 @@ from utils.session_state import update_workflow_step, save_suburb_data, backup_s
 from components.sample_files import render_sample_files_section
 import plotly.express as px
 import plotly.graph_objects as go
+from styles.professional_styles import apply_extended_styles
 
 def render_data_upload_page():
     """Render the data upload and validation page"""
 
+    apply_extended_styles()
+
     st.title("📊 Data Upload & Integration")
     st.subheader("Import Suburb Market Data")
 
@@ -6,10 +6,13 @@ import plotly.graph_objects as go
 from services.openai_service import OpenAIService
 from utils.session_state import update_workflow_step, save_recommendations, backup_session_data
 from models.ml_recommender import PropertyRecommendationEngine
+from styles.professional_styles import apply_extended_styles
 
 def render_recommendations_page():
     """Render the AI/ML recommendations page"""
 
+    apply_extended_styles()
+
     st.title("⭐ AI Property Recommendations")
     st.subheader("Machine Learning-Powered Investment Insights")
 
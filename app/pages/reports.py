@@ -20,10 +20,13 @@ from reportlab.graphics.charts.barcharts import VerticalBarChart
 import tempfile
 import os
 from utils.session_state import backup_session_data
+from styles.professional_styles import apply_extended_styles
 
 def render_reports_page():
     """Render the comprehensive reports page"""
 
+    apply_extended_styles()
+
     st.title("📋 Comprehensive Property Reports")
     st.subheader("Professional Investment Analysis Reports")
 
@@ -6,10 +6,13 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from models.ml_recommender import PropertyRecommendationEngine
 from utils.session_state import update_workflow_step
+from styles.professional_styles import apply_extended_styles
 
 def render_suburb_analysis_page():
     """Render the suburb analysis and filtering page"""
 
+    apply_extended_styles()
+
     st.title("🔍 Suburb Analysis & Filtering")
     st.subheader("Intelligent Property Market Analysis")
 
@@ -3,10 +3,76 @@ import numpy as np
 import streamlit as st
 import requests
 import json
-from typing import Dict, List, Optional, Any
+import heapq
+import os
+from collections import OrderedDict, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 import time
 
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Strips currency formatting from price strings in a single pass
+_PRICE_STRIP = str.maketrans('', '', '$,')
+
+LISTING_COLUMNS = [
+    'id', 'address', 'suburb', 'state', 'property_type', 'bedrooms', 'bathrooms', 'parking',
+    'estimated_price', 'price_display', 'land_size', 'floor_area', 'listing_date',
+    'days_on_market', 'description', 'agent', 'agency', 'listing_url'
+]
+
+# Annual expense components; stored as expense_<name> columns until listings are serialized
+EXPENSE_NAMES = ['property_management', 'maintenance_repairs', 'insurance', 'rates_taxes', 'vacancy_allowance']
+EXPENSE_COLUMNS = [f'expense_{name}' for name in EXPENSE_NAMES]
+
+# Risk flag labels, in the order they are reported
+RISK_FLAG_LABELS = [
+    'High Vacancy Area', 'Slow Market', 'High Stock Levels',
+    'Long Time on Market', 'Above Median Premium', 'Negative Cashflow'
+]
+
+# Bit weight of each risk flag, and the shared tuple of labels for every flag combination
+_RISK_FLAG_BITS = 1 << np.arange(len(RISK_FLAG_LABELS))
+_RISK_FLAG_COMBOS = [
+    tuple(label for bit, label in enumerate(RISK_FLAG_LABELS) if code >> bit & 1)
+    for code in range(1 << len(RISK_FLAG_LABELS))
+]
+
+PROPERTY_SUMMARY_COLUMNS = [
+    'Suburb', 'Address', 'Type', 'Bedrooms', 'Price', 'Weekly Rent',
+    'Net Cashflow', 'Rental Yield', 'Days on Market', 'Risk Flags', 'Listing URL'
+]
+
+# Domain search paging: results per page, and suburbs per search so no search hits the result cap
+DOMAIN_PAGE_SIZE = 200
+DOMAIN_LOCATIONS_PER_SEARCH = 5
+
+# Real API listing frames kept per finder, least recently used evicted first
+LISTINGS_CACHE_MAX_ENTRIES = 64
+
+# Below this many properties a plain loop beats building the score arrays
+VECTORIZED_SCORING_MIN_PROPERTIES = 1000
+
+
+def _score_properties(cashflow, yields, days, no_flags):
+    """Score one property from scalars, or many at once from numpy arrays"""
+
+    return (
+        30 * (cashflow > 0)  # Positive cashflow bonus
+        + 20 * (yields > 4.5)  # Good yield bonus
+        + 15 * (days < 30)  # Few days on market bonus
+        + 10 * no_flags  # No risk flags bonus
+        # Reasonable price bonus (not too far above median)
+        # This would need suburb median data for proper calculation
+        + 5
+    )
+
+
 class PropertyFinder:
     """
     Step 8: Property Finder - Pull current listings within shortlisted suburbs
@@ -20,40 +86,195 @@ class PropertyFinder:
             'mock': 'https://jsonplaceholder.typicode.com/posts'  # Mock API for testing
         }
         self.mock_data_enabled = True  # Enable mock data for MVP
+        self.domain_api_key = os.getenv('DOMAIN_API_KEY')
+
+        # Real API listings keyed by ((suburb, state), property preferences), in LRU order
+        self._listings_cache = OrderedDict()
+
+        # Keep-alive session for listing API calls
+        self.session = requests.Session()
 
     def find_properties_in_suburbs(self, shortlisted_suburbs: pd.DataFrame, customer_profile: Dict[str, Any]) -> Dict[str, Any]:
         """Find current property listings in shortlisted suburbs"""
 
         property_results = {}
 
-        for idx, suburb_row in shortlisted_suburbs.iterrows():
+        # Plain dict rows are much cheaper to build and query than per-row Series
+        columns = list(shortlisted_suburbs.columns)
+        suburbs = []
+        for idx, values in zip(shortlisted_suburbs.index, shortlisted_suburbs.itertuples(index=False, name=None)):
+            suburb_row = dict(zip(columns, values))
             suburb_name = suburb_row.get('Suburb', f'Suburb_{idx}')
             state = suburb_row.get('State', 'NSW')
+            suburbs.append((suburb_name, state, suburb_row))
 
             st.write(f"🏠 Searching properties in {suburb_name}, {state}...")
 
-            # Get property listings for this suburb
-            listings = self._get_listings_for_suburb(suburb_name, state, customer_profile)
+        if not suburbs:
+            return property_results
+
+        # Get property listings for every suburb
+        all_listings = self._fetch_listings([(name, state) for name, state, _ in suburbs], customer_profile)
 
-            # Filter and process listings
-            filtered_listings = self._filter_listings(listings, customer_profile, suburb_row)
+        # Process all suburbs as one frame so column operations amortize across suburbs
+        listings = pd.concat(all_listings, keys=range(len(suburbs)), names=['suburb_pos', None])
+        suburb_frame = pd.DataFrame([suburb_row for _, _, suburb_row in suburbs])
+        row_suburb_data = suburb_frame.iloc[listings.index.get_level_values(0)].set_axis(listings.index)
 
-            # Add cashflow calculations
-            listings_with_cashflow = self._add_cashflow_calculations(filtered_listings, suburb_row)
+        # Filter listings and add cashflow calculations and risk flags
+        enriched = self._enrich_listings(listings, customer_profile, row_suburb_data)
+        enriched_by_suburb = dict(iter(enriched.groupby(level=0, sort=False)))
 
-            # Add risk flags
-            listings_with_flags = self._add_risk_flags(listings_with_cashflow, suburb_row)
+        for pos, ((suburb_name, state, suburb_row), suburb_listings) in enumerate(zip(suburbs, all_listings)):
+            properties = self._listings_to_records(enriched_by_suburb.get(pos, enriched.iloc[:0]))
 
             property_results[suburb_name] = {
-                'suburb_data': suburb_row.to_dict(),
-                'total_listings': len(listings),
-                'filtered_listings': len(listings_with_flags),
-                'properties': listings_with_flags
+                'suburb_data': suburb_row,
+                'total_listings': len(suburb_listings),
+                'filtered_listings': len(properties),
+                'properties': properties
             }
 
         return property_results
 
-    def _get_listings_for_suburb(self, suburb: str, state: str, customer_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _fetch_listings(self, suburbs: List[Tuple[str, str]], customer_profile: Dict[str, Any]) -> List[pd.DataFrame]:
+        """Get property listings for each (suburb, state) pair, batching real API requests"""
+
+        # Mock generation is local, so there is nothing to batch
+        if self.mock_data_enabled:
+            return [self._get_listings_for_suburb(suburb, state, customer_profile) for suburb, state in suburbs]
+
+        prefs_key = json.dumps(customer_profile.get('property_preferences', {}), sort_keys=True, default=str)
+
+        results = {}
+        pending = []
+        for key in dict.fromkeys(suburbs):
+            cached = self._listings_cache.get((key, prefs_key))
+            if cached is None:
+                pending.append(key)
+            else:
+                self._listings_cache.move_to_end((key, prefs_key))
+                results[key] = cached.copy()
+
+        # One paged search per batch; a failed batch falls back to mock data on its own
+        failed = []
+        error = None
+        for start in range(0, len(pending), DOMAIN_LOCATIONS_PER_SEARCH):
+            batch = pending[start:start + DOMAIN_LOCATIONS_PER_SEARCH]
+            try:
+                fetched = self._get_listings_bulk(batch, customer_profile)
+            except (requests.RequestException, ValueError) as e:
+                failed.extend(batch)
+                error = e
+                continue
+
+            for key in batch:
+                listings = self._listings_frame(fetched.get(key, []))
+                self._listings_cache[(key, prefs_key)] = listings
+                if len(self._listings_cache) > LISTINGS_CACHE_MAX_ENTRIES:
+                    self._listings_cache.popitem(last=False)
+                results[key] = listings.copy()
+
+        if failed:
+            names = ', '.join(suburb for suburb, _ in failed)
+            st.warning(f"Could not fetch real listings for {names} ({error}). Using mock data.")
+            for suburb, state in failed:
+                results[(suburb, state)] = self._get_listings_for_suburb(suburb, state, customer_profile)
+
+        return [results[key] for key in suburbs]
+
+    def _get_listings_bulk(self, suburbs: List[Tuple[str, str]], customer_profile: Dict[str, Any]) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """Get property listings for several suburbs with one paged search request"""
+
+        if not self.domain_api_key:
+            raise ValueError("DOMAIN_API_KEY is not configured")
+
+        property_prefs = customer_profile.get('property_preferences', {})
+        price_range = property_prefs.get('price_range', {})
+
+        search = {
+            'listingType': 'Sale',
+            'locations': [{'suburb': suburb, 'state': state} for suburb, state in suburbs],
+            'propertyTypes': property_prefs.get('property_types', []),
+            'pageSize': DOMAIN_PAGE_SIZE
+        }
+        if price_range.get('min'):
+            search['minPrice'] = int(float(str(price_range['min']).translate(_PRICE_STRIP)))
+        if price_range.get('max'):
+            search['maxPrice'] = int(float(str(price_range['max']).translate(_PRICE_STRIP)))
+
+        # Dispatch results back to the requested suburbs
+        requested = {(suburb.lower(), state.upper()): (suburb, state) for suburb, state in suburbs}
+        grouped = defaultdict(list)
+
+        page_number = 1
+        while True:
+            search['pageNumber'] = page_number
+            response = self.session.post(
+                self.api_endpoints['domain'],
+                json=search,
+                headers={'X-Api-Key': self.domain_api_key},
+                timeout=30
+            )
+            response.raise_for_status()
+
+            results = response.json()
+            for result in results:
+                listing = self._parse_api_listing(result)
+                key = requested.get((listing['suburb'].lower(), listing['state'].upper()))
+                if key is not None:
+                    grouped[key].append(listing)
+
+            # A short page is the last one
+            if len(results) < DOMAIN_PAGE_SIZE:
+                break
+            page_number += 1
+
+        return grouped
+
+    def _parse_api_listing(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Domain search result into the listing format used by the finder"""
+
+        listing = result.get('listing', result)
+        details = listing.get('propertyDetails', {})
+        price_details = listing.get('priceDetails', {})
+        date_listed = str(listing.get('dateListed', ''))[:10]
+
+        try:
+            days_on_market = (datetime.now() - datetime.strptime(date_listed, '%Y-%m-%d')).days
+        except ValueError:
+            days_on_market = 0
+
+        estimated_price = int(price_details.get('price') or 0)
+
+        return {
+            'id': str(listing.get('id', '')),
+            'address': details.get('displayableAddress', ''),
+            'suburb': details.get('suburb', ''),
+            'state': details.get('state', ''),
+            'property_type': str(details.get('propertyType', '')).title(),
+            'bedrooms': details.get('bedrooms', 0),
+            'bathrooms': details.get('bathrooms', 0),
+            'parking': details.get('carspaces', 0),
+            'estimated_price': estimated_price,
+            'price_display': price_details.get('displayPrice', f"${estimated_price:,.0f}"),
+            'land_size': details.get('landArea'),
+            'floor_area': details.get('buildingArea'),
+            'listing_date': date_listed,
+            'days_on_market': days_on_market,
+            'description': listing.get('summaryDescription', ''),
+            'agent': '',
+            'agency': listing.get('advertiser', {}).get('name', ''),
+            'listing_url': f"https://www.domain.com.au/{listing.get('listingSlug', '')}"
+        }
+
+    @staticmethod
+    def _listings_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build a listings DataFrame with the standard columns from listing dicts"""
+
+        return pd.DataFrame.from_records(records, columns=LISTING_COLUMNS)
+
+    def _get_listings_for_suburb(self, suburb: str, state: str, customer_profile: Dict[str, Any]) -> pd.DataFrame:
         """Get property listings for a specific suburb"""
 
         if self.mock_data_enabled:
@@ -69,7 +290,7 @@ class PropertyFinder:
             st.warning(f"Could not fetch real listings for {suburb}. Using mock data.")
             return self._generate_mock_listings(suburb, state, customer_profile)
 
-    def _generate_mock_listings(self, suburb: str, state: str, customer_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_mock_listings(self, suburb: str, state: str, customer_profile: Dict[str, Any]) -> pd.DataFrame:
         """Generate realistic mock property listings for testing"""
 
         # Get customer preferences
@@ -78,220 +299,255 @@ class PropertyFinder:
         property_types = property_prefs.get('property_types', ['house'])
 
         try:
-            min_price = float(str(price_range.get('min', '500000')).replace('$', '').replace(',', ''))
-            max_price = float(str(price_range.get('max', '800000')).replace('$', '').replace(',', ''))
+            min_price = float(str(price_range.get('min', '500000')).translate(_PRICE_STRIP))
+            max_price = float(str(price_range.get('max', '800000')).translate(_PRICE_STRIP))
         except:
             min_price, max_price = 500000, 800000
 
         # Generate 5-15 mock listings
         num_listings = np.random.randint(5, 16)
-        listings = []
-
-        for i in range(num_listings):
-            # Random property details
-            bedrooms = np.random.choice([2, 3, 4, 5], p=[0.1, 0.4, 0.4, 0.1])
-            bathrooms = min(bedrooms, np.random.choice([1, 2, 3], p=[0.3, 0.5, 0.2]))
-            parking = np.random.choice([0, 1, 2, 3], p=[0.1, 0.3, 0.4, 0.2])
-
-            # Price based on bedrooms and customer range
-            base_price = np.random.uniform(min_price * 0.8, max_price * 1.2)
-            bedroom_multiplier = {2: 0.8, 3: 1.0, 4: 1.3, 5: 1.6}
-            estimated_price = base_price * bedroom_multiplier.get(bedrooms, 1.0)
-
-            # Property type
-            if property_types:
-                property_type = np.random.choice(property_types)
-            else:
-                property_type = np.random.choice(['house', 'unit', 'townhouse'], p=[0.6, 0.3, 0.1])
-
-            # Address
-            street_names = ['Main St', 'Oak Ave', 'Cedar Rd', 'Pine Cres', 'Elm Dr', 'Maple Ln']
-            street_number = np.random.randint(1, 200)
-            address = f"{street_number} {np.random.choice(street_names)}, {suburb}, {state}"
-
-            # Listing details
-            listing = {
-                'id': f"{suburb.lower().replace(' ', '_')}_{i+1}",
-                'address': address,
-                'suburb': suburb,
-                'state': state,
-                'property_type': property_type.title(),
-                'bedrooms': bedrooms,
-                'bathrooms': bathrooms,
-                'parking': parking,
-                'estimated_price': int(estimated_price),
-                'price_display': f"${estimated_price:,.0f}",
-                'land_size': np.random.randint(300, 1000) if property_type == 'house' else None,
-                'floor_area': np.random.randint(80, 250),
-                'listing_date': datetime.now().strftime('%Y-%m-%d'),
-                'days_on_market': np.random.randint(1, 120),
-                'description': f"Beautiful {bedrooms} bedroom {property_type} in sought-after {suburb}. Features modern amenities and great location.",
-                'agent': f"Agent {np.random.choice(['Smith', 'Johnson', 'Williams', 'Brown', 'Davis'])}",
-                'agency': f"{np.random.choice(['Premium', 'Elite', 'First National', 'Ray White', 'LJ Hooker'])} Real Estate",
-                'listing_url': f"https://example.com/listing/{suburb.lower()}_{i+1}"
-            }
-
-            listings.append(listing)
 
-        return listings
+        # Random property details
+        bedrooms = np.random.choice([2, 3, 4, 5], size=num_listings, p=[0.1, 0.4, 0.4, 0.1])
+        bathrooms = np.minimum(bedrooms, np.random.choice([1, 2, 3], size=num_listings, p=[0.3, 0.5, 0.2]))
+        parking = np.random.choice([0, 1, 2, 3], size=num_listings, p=[0.1, 0.3, 0.4, 0.2])
 
-    def _filter_listings(self, listings: List[Dict[str, Any]], customer_profile: Dict[str, Any], suburb_data: pd.Series) -> List[Dict[str, Any]]:
-        """Filter listings based on customer requirements"""
+        # Price based on bedrooms and customer range
+        base_price = np.random.uniform(min_price * 0.8, max_price * 1.2, size=num_listings)
+        bedroom_multiplier = np.array([0.8, 1.0, 1.3, 1.6])  # 2-5 bedrooms
+        estimated_price = base_price * bedroom_multiplier[bedrooms - 2]
 
-        if not listings:
-            return []
+        # Property type
+        if property_types:
+            property_type = np.random.choice(property_types, size=num_listings)
+        else:
+            property_type = np.random.choice(['house', 'unit', 'townhouse'], size=num_listings, p=[0.6, 0.3, 0.1])
+
+        # Address
+        street_names = ['Main St', 'Oak Ave', 'Cedar Rd', 'Pine Cres', 'Elm Dr', 'Maple Ln']
+        street_numbers = np.random.randint(1, 200, size=num_listings)
+        streets = np.random.choice(street_names, size=num_listings)
+
+        land_size = np.random.randint(300, 1000, size=num_listings)
+        floor_area = np.random.randint(80, 250, size=num_listings)
+        days_on_market = np.random.randint(1, 120, size=num_listings)
+        agents = np.random.choice(['Smith', 'Johnson', 'Williams', 'Brown', 'Davis'], size=num_listings)
+        agencies = np.random.choice(['Premium', 'Elite', 'First National', 'Ray White', 'LJ Hooker'], size=num_listings)
+
+        # Per-suburb string pieces, built once instead of per listing
+        address_suffix = f", {suburb}, {state}"
+        id_prefix = f"{suburb.lower().replace(' ', '_')}_"
+        url_prefix = f"https://example.com/listing/{suburb.lower()}_"
+        description_suffix = f" in sought-after {suburb}. Features modern amenities and great location."
+        listing_date = datetime.now().strftime('%Y-%m-%d')
+
+        types = property_type.tolist()
+        beds = bedrooms.tolist()
+        numbers = range(1, num_listings + 1)
+
+        # Listing details
+        return pd.DataFrame({
+            'id': [f"{id_prefix}{n}" for n in numbers],
+            'address': [f"{number} {street}{address_suffix}" for number, street in zip(street_numbers.tolist(), streets.tolist())],
+            'suburb': suburb,
+            'state': state,
+            'property_type': [t.title() for t in types],
+            'bedrooms': bedrooms,
+            'bathrooms': bathrooms,
+            'parking': parking,
+            'estimated_price': estimated_price.astype(np.int64),
+            'price_display': [f"${price:,.0f}" for price in estimated_price.tolist()],
+            'land_size': pd.array([size if t == 'house' else None for size, t in zip(land_size.tolist(), types)], dtype=object),
+            'floor_area': floor_area,
+            'listing_date': listing_date,
+            'days_on_market': days_on_market,
+            'description': [f"Beautiful {b} bedroom {t}{description_suffix}" for b, t in zip(beds, types)],
+            'agent': [f"Agent {name}" for name in agents.tolist()],
+            'agency': [f"{name} Real Estate" for name in agencies.tolist()],
+            'listing_url': [f"{url_prefix}{n}" for n in numbers]
+        }, columns=LISTING_COLUMNS)
+
+    def _listing_filter_mask(self, listings: pd.DataFrame, customer_profile: Dict[str, Any]) -> pd.Series:
+        """Build a boolean mask that applies the customer's listing filters"""
 
         property_prefs = customer_profile.get('property_preferences', {})
 
-        # Price filter
+        # Price filter bounds
+        flex_min, flex_max = float('-inf'), float('inf')
         price_range = property_prefs.get('price_range', {})
         if price_range.get('min') and price_range.get('max'):
             try:
-                min_price = float(str(price_range['min']).replace('$', '').replace(',', ''))
-                max_price = float(str(price_range['max']).replace('$', '').replace(',', ''))
+                min_price = float(str(price_range['min']).translate(_PRICE_STRIP))
+                max_price = float(str(price_range['max']).translate(_PRICE_STRIP))
 
                 # Apply with flexibility (±15%)
                 flex_min = min_price * 0.85
                 flex_max = max_price * 1.15
-
-                listings = [l for l in listings if flex_min <= l.get('estimated_price', 0) <= flex_max]
             except:
                 pass
 
-        # Property type filter
-        property_types = property_prefs.get('property_types', [])
-        if property_types:
-            listings = [l for l in listings if l.get('property_type', '').lower() in [pt.lower() for pt in property_types]]
-
-        # Bedroom filter
+        # Bedroom filter bounds
+        min_br, max_br = float('-inf'), float('inf')
         bedroom_range = property_prefs.get('bedroom_range', '')
         if bedroom_range and '-' in bedroom_range:
             try:
                 min_br, max_br = map(int, bedroom_range.split('-'))
-                listings = [l for l in listings if min_br <= l.get('bedrooms', 0) <= max_br]
             except:
                 pass
 
-        return listings
+        mask = (
+            listings['estimated_price'].fillna(0).between(flex_min, flex_max)
+            & listings['bedrooms'].fillna(0).between(min_br, max_br)
+        )
 
-    def _add_cashflow_calculations(self, listings: List[Dict[str, Any]], suburb_data: pd.Series) -> List[Dict[str, Any]]:
-        """Add quick cashflow calculations to each property"""
+        # Property type filter
+        property_types = property_prefs.get('property_types', [])
+        if property_types:
+            allowed_types = {pt.lower() for pt in property_types}
+            mask &= listings['property_type'].fillna('').str.lower().isin(allowed_types)
 
-        suburb_yield = suburb_data.get('Rental Yield on Houses', 4.0)
-        median_price = suburb_data.get('Median Price', 600000)
+        return mask
 
-        for listing in listings:
-            price = listing.get('estimated_price', median_price)
+    @staticmethod
+    def _as_dict(suburb_data: Union[Dict[str, Any], pd.Series, pd.DataFrame]) -> Union[Dict[str, Any], pd.DataFrame]:
+        """Convert a single suburb row to a plain dict; per-listing suburb frames pass through"""
 
-            # Estimate rental based on suburb yield and property size
-            bedrooms = listing.get('bedrooms', 3)
-            bedroom_multiplier = {1: 0.7, 2: 0.85, 3: 1.0, 4: 1.2, 5: 1.4}
+        return suburb_data.to_dict() if isinstance(suburb_data, pd.Series) else suburb_data
 
-            # Base rental calculation
-            annual_rent = price * (suburb_yield / 100) * bedroom_multiplier.get(bedrooms, 1.0)
-            weekly_rent = annual_rent / 52
+    def _enrich_listings(self, listings: pd.DataFrame, customer_profile: Dict[str, Any], suburb_data: Union[Dict[str, Any], pd.Series, pd.DataFrame]) -> pd.DataFrame:
+        """Filter listings and add cashflow calculations and risk flags
 
-            # Expenses (typical percentages)
-            expenses = {
-                'property_management': annual_rent * 0.08,  # 8%
-                'maintenance_repairs': annual_rent * 0.05,  # 5%
-                'insurance': annual_rent * 0.02,  # 2%
-                'rates_taxes': price * 0.01,  # 1% of property value
-                'vacancy_allowance': annual_rent * 0.02  # 2%
-            }
+        suburb_data is either a single suburb row, or a DataFrame of suburb
+        fields aligned row-for-row with listings.
+        """
 
-            total_annual_expenses = sum(expenses.values())
-            net_annual_rent = annual_rent - total_annual_expenses
-            net_weekly_rent = net_annual_rent / 52
-
-            # Financing assumptions (80% LVR, 6% interest)
-            loan_amount = price * 0.8
-            annual_interest = loan_amount * 0.06
-            weekly_interest = annual_interest / 52
-
-            # Net cashflow
-            net_weekly_cashflow = net_weekly_rent - weekly_interest
-
-            # Add to listing
-            listing.update({
-                'estimated_weekly_rent': round(weekly_rent),
-                'estimated_annual_rent': round(annual_rent),
-                'total_annual_expenses': round(total_annual_expenses),
-                'net_annual_rent': round(net_annual_rent),
-                'net_weekly_cashflow': round(net_weekly_cashflow),
-                'rental_yield': round((annual_rent / price) * 100, 2),
-                'net_yield': round((net_annual_rent / price) * 100, 2),
-                'expenses_breakdown': {k: round(v) for k, v in expenses.items()}
-            })
+        mask = self._listing_filter_mask(listings, customer_profile)
+        enriched = listings[mask].copy()
+        if isinstance(suburb_data, pd.DataFrame):
+            suburb_data = suburb_data[mask]
 
-        return listings
+        enriched = self._add_cashflow_calculations(enriched, suburb_data)
+        return self._add_risk_flags(enriched, suburb_data)
 
-    def _add_risk_flags(self, listings: List[Dict[str, Any]], suburb_data: pd.Series) -> List[Dict[str, Any]]:
-        """Add risk flags to properties"""
+    def _add_cashflow_calculations(self, listings: pd.DataFrame, suburb_data: Union[Dict[str, Any], pd.Series, pd.DataFrame]) -> pd.DataFrame:
+        """Add quick cashflow calculations to each property"""
 
-        # Suburb-level risk indicators
-        vacancy_rate = suburb_data.get('Vacancy Rate', 3.0)
-        days_on_market = suburb_data.get('Sales Days on Market', 30)
-        som_percentage = suburb_data.get('Stock on Market Percentage (SOM%)', 3.0)
+        suburb_data = self._as_dict(suburb_data)
+        suburb_yield = suburb_data.get('Rental Yield on Houses', 4.0)
+        median_price = suburb_data.get('Median Price', 600000)
 
-        risk_flags = []
+        price = listings['estimated_price'].fillna(median_price).astype(np.float64)
+
+        # Estimate rental based on suburb yield and property size
+        bedroom_multiplier = listings['bedrooms'].map({1: 0.7, 2: 0.85, 3: 1.0, 4: 1.2, 5: 1.4}).fillna(1.0)
+
+        # Base rental calculation
+        annual_rent = price * (suburb_yield / 100) * bedroom_multiplier
+        weekly_rent = annual_rent / 52
+
+        # Expenses (typical percentages)
+        expenses = [
+            annual_rent * 0.08,  # property management 8%
+            annual_rent * 0.05,  # maintenance/repairs 5%
+            annual_rent * 0.02,  # insurance 2%
+            price * 0.01,  # rates/taxes 1% of property value
+            annual_rent * 0.02  # vacancy allowance 2%
+        ]
+
+        total_annual_expenses = expenses[0] + expenses[1] + expenses[2] + expenses[3] + expenses[4]
+        net_annual_rent = annual_rent - total_annual_expenses
+        net_weekly_rent = net_annual_rent / 52
+
+        # Financing assumptions (80% LVR, 6% interest)
+        loan_amount = price * 0.8
+        annual_interest = loan_amount * 0.06
+        weekly_interest = annual_interest / 52
+
+        # Net cashflow
+        net_weekly_cashflow = net_weekly_rent - weekly_interest
+
+        # Add to listings
+        listings['estimated_weekly_rent'] = weekly_rent.round().astype(np.int64)
+        listings['estimated_annual_rent'] = annual_rent.round().astype(np.int64)
+        listings['total_annual_expenses'] = total_annual_expenses.round().astype(np.int64)
+        listings['net_annual_rent'] = net_annual_rent.round().astype(np.int64)
+        listings['net_weekly_cashflow'] = net_weekly_cashflow.round().astype(np.int64)
+        listings['rental_yield'] = ((annual_rent / price) * 100).round(2)
+        listings['net_yield'] = ((net_annual_rent / price) * 100).round(2)
+        for column, expense in zip(EXPENSE_COLUMNS, expenses):
+            listings[column] = expense.round().astype(np.int64)
 
-        # High vacancy risk
-        if vacancy_rate > 5.0:
-            risk_flags.append('High Vacancy Area')
+        return listings
 
-        # Slow selling market
-        if days_on_market > 45:
-            risk_flags.append('Slow Market')
+    def _add_risk_flags(self, listings: pd.DataFrame, suburb_data: Union[Dict[str, Any], pd.Series, pd.DataFrame]) -> pd.DataFrame:
+        """Add risk flags to properties"""
 
-        # High stock levels
-        if som_percentage > 5.0:
-            risk_flags.append('High Stock Levels')
+        suburb_data = self._as_dict(suburb_data)
+        median_price = suburb_data.get('Median Price', 600000)
 
-        for listing in listings:
-            property_flags = list(risk_flags)
+        # One boolean column per entry in RISK_FLAG_LABELS
+        conditions = [
+            # Suburb-level risk indicators
+            suburb_data.get('Vacancy Rate', 3.0) > 5.0,  # High vacancy risk
+            suburb_data.get('Sales Days on Market', 30) > 45,  # Slow selling market
+            suburb_data.get('Stock on Market Percentage (SOM%)', 3.0) > 5.0,  # High stock levels
 
             # Property-specific flags
-            if listing.get('days_on_market', 0) > 60:
-                property_flags.append('Long Time on Market')
+            listings['days_on_market'].fillna(0) > 60,
+            listings['estimated_price'].fillna(0) > median_price * 1.5,  # Price vs median comparison
+            listings['net_weekly_cashflow'] < -200  # Cashflow flags
+        ]
+        flags = np.column_stack([
+            np.broadcast_to(np.asarray(condition, dtype=bool), len(listings)) for condition in conditions
+        ])
+
+        # Encode each row's flags as a bitmask so listings with the same flags share one tuple
+        codes = flags @ _RISK_FLAG_BITS
+        listings['risk_flags'] = [_RISK_FLAG_COMBOS[code] for code in codes.tolist()]
 
-            # Price vs median comparison
-            median_price = suburb_data.get('Median Price', 600000)
-            if listing.get('estimated_price', 0) > median_price * 1.5:
-                property_flags.append('Above Median Premium')
+        return listings
 
-            # Cashflow flags
-            if listing.get('net_weekly_cashflow', 0) < -200:
-                property_flags.append('Negative Cashflow')
+    def _listings_to_records(self, listings: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Serialize enriched listings to the list-of-dicts format used for display"""
 
-            listing['risk_flags'] = property_flags
+        records = listings.drop(columns=EXPENSE_COLUMNS).to_dict('records')
+        for record, expenses in zip(records, listings[EXPENSE_COLUMNS].to_numpy().tolist()):
+            record['expenses_breakdown'] = dict(zip(EXPENSE_NAMES, expenses))
 
-        return listings
+        return records
 
     def create_property_summary(self, property_results: Dict[str, Any]) -> pd.DataFrame:
         """Create a summary DataFrame of all found properties"""
 
-        summary_data = []
+        rows = self._iter_summary_rows(property_results)
+        summary = pd.DataFrame.from_records(rows, columns=PROPERTY_SUMMARY_COLUMNS)
+
+        # Arrow-backed columns are contiguous typed buffers rather than object arrays
+        if PYARROW_AVAILABLE:
+            summary = summary.convert_dtypes(dtype_backend='pyarrow')
+
+        return summary
+
+    def _iter_summary_rows(self, property_results: Dict[str, Any]) -> Iterator[Tuple[Any, ...]]:
+        """Yield one summary row per property, in PROPERTY_SUMMARY_COLUMNS order"""
 
         for suburb_name, suburb_result in property_results.items():
             properties = suburb_result.get('properties', [])
 
             for prop in properties:
-                summary_data.append({
-                    'Suburb': suburb_name,
-                    'Address': prop.get('address', ''),
-                    'Type': prop.get('property_type', ''),
-                    'Bedrooms': prop.get('bedrooms', 0),
-                    'Price': prop.get('estimated_price', 0),
-                    'Weekly Rent': prop.get('estimated_weekly_rent', 0),
-                    'Net Cashflow': prop.get('net_weekly_cashflow', 0),
-                    'Rental Yield': prop.get('rental_yield', 0),
-                    'Days on Market': prop.get('days_on_market', 0),
-                    'Risk Flags': ', '.join(prop.get('risk_flags', [])),
-                    'Listing URL': prop.get('listing_url', '')
-                })
-
-        return pd.DataFrame(summary_data)
+                yield (
+                    suburb_name,
+                    prop.get('address', ''),
+                    prop.get('property_type', ''),
+                    prop.get('bedrooms', 0),
+                    prop.get('estimated_price', 0),
+                    prop.get('estimated_weekly_rent', 0),
+                    prop.get('net_weekly_cashflow', 0),
+                    prop.get('rental_yield', 0),
+                    prop.get('days_on_market', 0),
+                    ', '.join(prop.get('risk_flags', [])),
+                    prop.get('listing_url', '')
+                )
 
     def get_best_properties(self, property_results: Dict[str, Any], top_n: int = 10) -> List[Dict[str, Any]]:
         """Get the best properties across all suburbs based on multiple criteria"""
@@ -308,34 +564,28 @@ class PropertyFinder:
             return []
 
         # Score properties
-        for prop in all_properties:
-            score = 0
-
-            # Positive cashflow bonus
-            if prop.get('net_weekly_cashflow', 0) > 0:
-                score += 30
-
-            # Good yield bonus
-            if prop.get('rental_yield', 0) > 4.5:
-                score += 20
-
-            # Few days on market bonus
-            if prop.get('days_on_market', 0) < 30:
-                score += 15
-
-            # No risk flags bonus
-            if not prop.get('risk_flags', []):
-                score += 10
-
-            # Reasonable price bonus (not too far above median)
-            # This would need suburb median data for proper calculation
-            score += 5
-
-            prop['property_score'] = score
-
-        # Sort by score and return top N
-        sorted_properties = sorted(all_properties, key=lambda x: x.get('property_score', 0), reverse=True)
-        return sorted_properties[:top_n]
+        count = len(all_properties)
+        if count < VECTORIZED_SCORING_MIN_PROPERTIES:
+            for prop in all_properties:
+                prop['property_score'] = _score_properties(
+                    prop.get('net_weekly_cashflow', 0),
+                    prop.get('rental_yield', 0),
+                    prop.get('days_on_market', 0),
+                    not prop.get('risk_flags')
+                )
+        else:
+            cashflow = np.fromiter((p.get('net_weekly_cashflow', 0) for p in all_properties), dtype=np.float64, count=count)
+            yields = np.fromiter((p.get('rental_yield', 0) for p in all_properties), dtype=np.float64, count=count)
+            days = np.fromiter((p.get('days_on_market', 0) for p in all_properties), dtype=np.float64, count=count)
+            no_flags = np.fromiter((not p.get('risk_flags') for p in all_properties), dtype=bool, count=count)
+
+            scores = _score_properties(cashflow, yields, days, no_flags)
+
+            for prop, score in zip(all_properties, scores.tolist()):
+                prop['property_score'] = score
+
+        # Return top N by score
+        return heapq.nlargest(top_n, all_properties, key=itemgetter('property_score'))
 
     def generate_property_insights(self, property_results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate insights about the property search results"""
@@ -0,0 +1,84 @@
+// Runs inside the components.html iframe, so work against the app's own document
+const appWindow = window.parent;
+const appDocument = appWindow.document;
+
+// The sidebar can mount after this script runs; look for it this often, for up to ~10 s
+const SIDEBAR_RETRY_MS = 250;
+const SIDEBAR_RETRY_LIMIT = 40;
+
+// Sidebar toggle functionality
+function initSidebarToggle(attempt) {
+    // Create toggle button
+    let toggleBtn = appDocument.getElementById('sidebar-toggle');
+    if (!toggleBtn) {
+        toggleBtn = appDocument.createElement('button');
+        toggleBtn.id = 'sidebar-toggle';
+        toggleBtn.className = 'sidebar-toggle-btn';
+        toggleBtn.innerHTML = '☰ Menu';
+        appDocument.body.appendChild(toggleBtn);
+    }
+    // Rebind on every init: a handler from an earlier, removed iframe no longer runs
+    toggleBtn.onclick = function() {
+        toggleSidebar();
+    };
+
+    const sidebar = appDocument.querySelector('section[data-testid="stSidebar"]');
+    if (!sidebar) {
+        if (attempt < SIDEBAR_RETRY_LIMIT) {
+            setTimeout(function() { initSidebarToggle(attempt + 1); }, SIDEBAR_RETRY_MS);
+        }
+        return;
+    }
+
+    // Replace any observer left by an earlier iframe, whose callback may be gone with it
+    if (appWindow.__pfSidebarObserver) {
+        appWindow.__pfSidebarObserver.disconnect();
+    }
+
+    // Watch the sidebar box itself; ResizeObserver delivers the width without a layout read
+    const observer = new appWindow.ResizeObserver(function(entries) {
+        updateSidebarState(entries[0].contentRect.width);
+    });
+    observer.observe(sidebar);
+    appWindow.__pfSidebarObserver = observer;
+}
+
+function updateSidebarState(sidebarWidth) {
+    const appContainer = appDocument.querySelector('.stApp');
+    const toggleBtn = appDocument.getElementById('sidebar-toggle');
+
+    if (appContainer && toggleBtn) {
+        const isCollapsed = sidebarWidth < 50;
+        const state = isCollapsed ? 'collapsed' : 'expanded';
+
+        // Only write when the state flips, so unchanged frames don't invalidate styles
+        if (appContainer.dataset.sidebarState === state) return;
+
+        appContainer.dataset.sidebarState = state;
+        toggleBtn.style.display = isCollapsed ? 'block' : 'none';
+        if (isCollapsed) {
+            toggleBtn.innerHTML = '☰ Menu';
+        }
+    }
+}
+
+function toggleSidebar() {
+    // Click Streamlit's own expand control; it is rendered in the header only while
+    // the sidebar is collapsed, and click() still fires while the CSS hides it
+    const expandButton = appDocument.querySelector('button[data-testid="stExpandSidebarButton"]');
+    if (expandButton) {
+        expandButton.click();
+    }
+}
+
+// Initialize when the browser is idle after Streamlit has rendered; each component
+// iframe sets up its own handlers, replacing those of any earlier one
+function initProfessionalStyles() {
+    initSidebarToggle(0);
+}
+
+if ('requestIdleCallback' in window) {
+    requestIdleCallback(initProfessionalStyles, { timeout: 2000 });
+} else {
+    setTimeout(initProfessionalStyles, 0);
+}
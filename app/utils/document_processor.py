@@ -1,11 +1,138 @@
 import streamlit as st
-from docx import Document
-import PyPDF2
+import zipfile
+from lxml import etree
 from io import BytesIO
 import pandas as pd
-import openpyxl
+import numpy as np
+from importlib.util import find_spec
 from typing import Optional, Union, Dict, Any
 
+# PDF and Excel backends are imported where they are used, so app startup
+# does not pay for them; only their presence is checked here
+PYMUPDF_AVAILABLE = find_spec('pymupdf') is not None
+CALAMINE_AVAILABLE = find_spec('python_calamine') is not None  # pandas' "calamine" Excel engine
+
+# Rows inspected when estimating the missing-value ratio of a large upload
+VALIDATION_SAMPLE_ROWS = 10000
+
+# Rows read when looking for the real header of an Excel sheet: candidates 0-5 plus the row below
+EXCEL_HEADER_SCAN_ROWS = 7
+
+# Bounds on the per-upload caches, so uploads from every session aren't held for the process lifetime
+UPLOAD_CACHE_MAX_ENTRIES = 16
+UPLOAD_CACHE_TTL_SECONDS = 3600
+
+# WordprocessingML tags used when streaming the main document part
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY = _W_NS + 'body'
+_W_P = _W_NS + 'p'
+_W_R = _W_NS + 'r'
+_W_HYPERLINK = _W_NS + 'hyperlink'
+_W_T = _W_NS + 't'
+_W_BR = _W_NS + 'br'
+_W_TBL = _W_NS + 'tbl'
+_W_TR = _W_NS + 'tr'
+_W_TR_PR = _W_NS + 'trPr'
+_W_GRID_BEFORE = _W_NS + 'gridBefore'
+_W_TC = _W_NS + 'tc'
+_W_TC_PR = _W_NS + 'tcPr'
+_W_GRID_SPAN = _W_NS + 'gridSpan'
+_W_V_MERGE = _W_NS + 'vMerge'
+_W_VAL = _W_NS + 'val'
+_W_TYPE = _W_NS + 'type'
+
+# Run children other than w:t and w:br, with the text python-docx renders for them
+_W_RUN_TEXT = {_W_NS + 'tab': '\t', _W_NS + 'ptab': '\t', _W_NS + 'cr': '\n', _W_NS + 'noBreakHyphen': '-'}
+
+# Package relationships locating the main document part
+_PKG_RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _normalize_column_name(name) -> str:
+    """Lowercase a column name and drop spaces and parentheses for loose matching"""
+    return str(name).lower().replace(" ", "").replace("(", "").replace(")", "")
+
+
+def _count_unnamed_headers(header_cells: pd.Series) -> int:
+    """Cells of a raw header row that pandas would label as Unnamed columns"""
+    return int((header_cells.isna() | header_cells.str.startswith('Unnamed:', na=False)).sum())
+
+
+def _docx_main_part(archive: zipfile.ZipFile) -> str:
+    """Name of the main document part, as declared in the package relationships"""
+    rels = etree.fromstring(archive.read('_rels/.rels'))
+    for rel in rels.iterchildren(_PKG_RELS_NS + 'Relationship'):
+        if rel.get('Type', '').endswith('/officeDocument'):
+            return rel.get('Target', '').lstrip('/')
+    raise KeyError("package has no officeDocument relationship")
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """Text of a w:p element as python-docx renders it: w:r and w:hyperlink runs only"""
+    parts = []
+    for child in paragraph:
+        if child.tag == _W_R:
+            runs = (child,)
+        elif child.tag == _W_HYPERLINK:
+            runs = child.iterchildren(_W_R)
+        else:
+            continue
+        for run in runs:
+            # Only direct run content; drawings, pictures and text boxes are skipped
+            for node in run:
+                if node.tag == _W_T:
+                    parts.append(node.text or '')
+                elif node.tag == _W_BR:
+                    # Line breaks only; page and column breaks have no text
+                    if node.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                        parts.append('\n')
+                else:
+                    parts.append(_W_RUN_TEXT.get(node.tag, ''))
+    return ''.join(parts)
+
+
+def _docx_int_property(parent, props_tag: str, tag: str, default: int) -> int:
+    """Integer w:val of a table row or cell property, e.g. w:gridSpan under w:tcPr"""
+    prop = parent.find(f'{props_tag}/{tag}')
+    return default if prop is None else int(prop.get(_W_VAL, default))
+
+
+def _docx_cell_above(tc):
+    """The w:tc at the same grid offset in the previous row; python-docx raises when there is none"""
+    row = tc.getparent()
+    offset = _docx_int_property(row, _W_TR_PR, _W_GRID_BEFORE, 0) + sum(
+        _docx_int_property(cell, _W_TC_PR, _W_GRID_SPAN, 1) for cell in tc.itersiblings(_W_TC, preceding=True)
+    )
+    row_above = next(row.itersiblings(_W_TR, preceding=True), None)
+    if row_above is None:
+        raise ValueError("no tr above topmost tr")
+
+    position = _docx_int_property(row_above, _W_TR_PR, _W_GRID_BEFORE, 0)
+    for cell in row_above.iterchildren(_W_TC):
+        if position == offset:
+            return cell
+        position += _docx_int_property(cell, _W_TC_PR, _W_GRID_SPAN, 1)
+        if position > offset:
+            break
+    raise ValueError(f"no tc element at grid_offset={offset}")
+
+
+def _docx_row_cells(row) -> list:
+    """w:tc elements of a row as python-docx's row.cells yields them
+
+    Horizontally spanned cells repeat once per grid column, and continued
+    vertical merges resolve to the cell that starts the merge.
+    """
+    cells = []
+    for tc in row.iterchildren(_W_TC):
+        merge = tc.find(f'{_W_TC_PR}/{_W_V_MERGE}')
+        while merge is not None and merge.get(_W_VAL, 'continue') == 'continue':
+            tc = _docx_cell_above(tc)
+            merge = tc.find(f'{_W_TC_PR}/{_W_V_MERGE}')
+        cells.extend([tc] * _docx_int_property(tc, _W_TC_PR, _W_GRID_SPAN, 1))
+    return cells
+
+
 class DocumentProcessor:
     """Utility class for processing various document types"""
 
@@ -13,24 +140,41 @@ class DocumentProcessor:
     def extract_text_from_docx(file_buffer: BytesIO) -> str:
         """Extract text content from a DOCX file"""
         try:
-            doc = Document(file_buffer)
-            text_content = []
+            paragraphs = []
+            table_rows = []
+
+            # Stream the main document part instead of building python-docx wrappers for every node
+            with zipfile.ZipFile(file_buffer) as archive, archive.open(_docx_main_part(archive)) as xml:
+                for _, elem in etree.iterparse(xml, events=('end',), tag=(_W_P, _W_TR, _W_TBL)):
+                    parent = elem.getparent()
+
+                    if elem.tag == _W_TR:
+                        # Rows of top-level tables only, one " | "-joined line per row
+                        if parent.getparent() is not None and parent.getparent().tag == _W_BODY:
+                            row_text = []
+                            for cell in _docx_row_cells(elem):
+                                cell_text = "\n".join(_docx_paragraph_text(p) for p in cell.iterchildren(_W_P)).strip()
+                                if cell_text:
+                                    row_text.append(cell_text)
+                            if row_text:
+                                table_rows.append(" | ".join(row_text))
+                        continue
 
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content.append(paragraph.text.strip())
+                    if parent is None or parent.tag != _W_BODY:
+                        continue
 
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        text_content.append(" | ".join(row_text))
+                    if elem.tag == _W_P:
+                        text = _docx_paragraph_text(elem).strip()
+                        if text:
+                            paragraphs.append(text)
 
-            return "\n".join(text_content)
+                    # Free finished top-level blocks so memory stays bounded
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+            # Paragraphs first, then table rows, as before
+            return "\n".join(paragraphs + table_rows)
 
         except Exception as e:
             st.error(f"Error processing DOCX file: {str(e)}")
@@ -40,6 +184,16 @@ class DocumentProcessor:
     def extract_text_from_pdf(file_buffer: BytesIO) -> str:
         """Extract text content from a PDF file"""
         try:
+            if PYMUPDF_AVAILABLE:
+                import pymupdf
+
+                # MuPDF parses in C, roughly an order of magnitude faster than PyPDF2
+                with pymupdf.open(stream=file_buffer.getvalue(), filetype="pdf") as doc:
+                    text_content = [text for text in (page.get_text("text").strip() for page in doc) if text]
+                return "\n".join(text_content)
+
+            import PyPDF2
+
             pdf_reader = PyPDF2.PdfReader(file_buffer)
             text_content = []
 
@@ -59,22 +213,16 @@ class DocumentProcessor:
     def extract_text_from_txt(file_buffer: BytesIO) -> str:
         """Extract text content from a plain text file"""
         try:
-            # Reset buffer position to beginning
+            # Read the bytes once; the fallback decodes the same buffer again
             file_buffer.seek(0)
-            content = file_buffer.read().decode('utf-8')
-            st.write(f"🔍 TXT file decoded, content length: {len(content)}")
+            raw = file_buffer.read()
+            try:
+                content = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                # latin-1 maps every byte, so this cannot fail
+                content = raw.decode('latin-1')
             return content.strip()
 
-        except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                file_buffer.seek(0)
-                content = file_buffer.read().decode('latin-1')
-                st.write(f"🔍 TXT file decoded with latin-1, content length: {len(content)}")
-                return content.strip()
-            except Exception as e:
-                st.error(f"Error processing text file with fallback encoding: {str(e)}")
-                return ""
         except Exception as e:
             st.error(f"Error processing text file: {str(e)}")
             return ""
@@ -87,32 +235,27 @@ class DocumentProcessor:
             return None
 
         file_extension = uploaded_file.name.lower().split('.')[-1]
-        st.write(f"📄 Processing file: {uploaded_file.name}")
-        st.write(f"📁 File extension: {file_extension}")
-        st.write(f"📊 File size: {uploaded_file.size} bytes")
+        debug_lines = [
+            f"📄 Processing file: {uploaded_file.name}",
+            f"📁 File extension: {file_extension}",
+            f"📊 File size: {uploaded_file.size} bytes",
+        ]
+
+        if file_extension not in ('docx', 'pdf', 'txt', 'text'):
+            st.error(f"❌ Unsupported file format: {file_extension}")
+            return None
 
         try:
-            # Create BytesIO object from uploaded file
-            file_buffer = BytesIO(uploaded_file.read())
-            st.write(f"✅ File read into buffer, size: {len(file_buffer.getvalue())} bytes")
-
-            if file_extension == 'docx':
-                content = DocumentProcessor.extract_text_from_docx(file_buffer)
-            elif file_extension == 'pdf':
-                content = DocumentProcessor.extract_text_from_pdf(file_buffer)
-            elif file_extension in ['txt', 'text']:
-                content = DocumentProcessor.extract_text_from_txt(file_buffer)
-            else:
-                st.error(f"❌ Unsupported file format: {file_extension}")
-                return None
+            # Cached on the file bytes, so reruns on the same upload skip the parse
+            content = _extract_document_text(uploaded_file.name, uploaded_file.getvalue())
 
             if content:
-                st.write(f"✅ Text extracted successfully, length: {len(content)} characters")
-                with st.expander("🔍 Extracted Content Preview (Debug)"):
-                    st.text_area("Content", content[:1000] + "..." if len(content) > 1000 else content, height=200)
+                debug_lines.append(f"✅ Text extracted successfully, length: {len(content)} characters")
+                DocumentProcessor._show_debug(debug_lines, content)
                 return content
             else:
                 st.error("❌ No content extracted from file")
+                DocumentProcessor._show_debug(debug_lines)
                 return None
 
         except Exception as e:
@@ -121,78 +264,83 @@ class DocumentProcessor:
             st.code(traceback.format_exc())
             return None
 
+    @staticmethod
+    def _show_debug(debug_lines, content: Optional[str] = None):
+        """Render collected processing details in one block when debug mode is on"""
+        if not st.session_state.get('debug', False):
+            return
+
+        st.code("\n".join(debug_lines))
+        if content:
+            with st.expander("🔍 Extracted Content Preview (Debug)"):
+                st.text_area("Content", content[:1000] + "..." if len(content) > 1000 else content, height=200)
+
     @staticmethod
     def load_data_file(uploaded_file) -> Optional[pd.DataFrame]:
         """Load data from CSV or Excel files"""
         if uploaded_file is None:
             return None
 
-        file_extension = uploaded_file.name.lower().split('.')[-1]
-
-        try:
-            if file_extension == 'csv':
-                df = pd.read_csv(uploaded_file)
-            elif file_extension in ['xlsx', 'xls']:
-                df = DocumentProcessor._load_excel_with_smart_headers(uploaded_file)
-            else:
-                st.error(f"Unsupported data file format: {file_extension}")
-                return None
-
-            return df
-
-        except Exception as e:
-            st.error(f"Error loading data file: {str(e)}")
-            return None
+        # Cached on the file bytes, so reruns on the same upload skip the parse
+        return _load_data_bytes(uploaded_file.name, uploaded_file.getvalue())
 
     @staticmethod
     def _load_excel_with_smart_headers(uploaded_file) -> Optional[pd.DataFrame]:
         """Load Excel file with smart header detection for HtAG files"""
         try:
-            # First, try loading with default header (row 0)
-            df_default = pd.read_excel(uploaded_file)
+            # Open the workbook once; the header scan and the final parse both reuse it
+            uploaded_file.seek(0)
+            if CALAMINE_AVAILABLE:
+                # Rust reader, typically several times faster than openpyxl
+                xl = pd.ExcelFile(uploaded_file, engine='calamine')
+            else:
+                xl = pd.ExcelFile(uploaded_file)
+
+            # Read only the top rows, raw, to judge the header candidates; the sheet
+            # itself is parsed in full exactly once, with whichever header wins
+            preview = xl.parse(0, header=None, nrows=EXCEL_HEADER_SCAN_ROWS, dtype=str)
+            if preview.empty:
+                return xl.parse(0)
 
             # Check if we have "Unnamed" columns, which indicates headers might be elsewhere
-            unnamed_count = sum(1 for col in df_default.columns if str(col).startswith('Unnamed:'))
+            unnamed_count = _count_unnamed_headers(preview.iloc[0])
 
-            if unnamed_count > df_default.shape[1] * 0.8:  # If >80% columns are unnamed
+            if unnamed_count > preview.shape[1] * 0.8:  # If >80% columns are unnamed
                 st.info("🔍 Detected Excel file with non-standard header layout, searching for proper headers...")
 
-                # Try loading with different header rows (0-5)
-                for header_row in range(min(6, len(df_default))):
-                    try:
-                        df_test = pd.read_excel(uploaded_file, header=header_row)
-
-                        # Skip if this row is empty or still has many unnamed columns
-                        if df_test.empty:
-                            continue
+                # Try the different header rows (0-5)
+                for header_row in range(min(6, len(preview) - 1)):
+                    # Skip if there is no data below this row
+                    if preview.iloc[header_row + 1:].dropna(how='all').empty:
+                        continue
 
-                        unnamed_test = sum(1 for col in df_test.columns if str(col).startswith('Unnamed:'))
+                    header_cells = preview.iloc[header_row]
+                    unnamed_test = _count_unnamed_headers(header_cells)
 
-                        # If we significantly reduced unnamed columns, this might be the header row
-                        if unnamed_test < df_test.shape[1] * 0.3:  # <30% unnamed columns
-                            # Check if this looks like property/suburb data
-                            column_names = [str(col).lower() for col in df_test.columns]
-                            property_indicators = [
-                                'area', 'suburb', 'location', 'price', 'rent', 'yield',
-                                'population', 'state', 'region', 'distance', 'growth'
-                            ]
+                    # If we significantly reduced unnamed columns, this might be the header row
+                    if unnamed_test < preview.shape[1] * 0.3:  # <30% unnamed columns
+                        # Check if this looks like property/suburb data
+                        column_names = [str(col).lower() for col in header_cells.dropna()]
+                        property_indicators = [
+                            'area', 'suburb', 'location', 'price', 'rent', 'yield',
+                            'population', 'state', 'region', 'distance', 'growth'
+                        ]
 
-                            matches = sum(1 for indicator in property_indicators
-                                        for col in column_names if indicator in col)
+                        matches = sum(1 for indicator in property_indicators
+                                    for col in column_names if indicator in col)
 
-                            if matches >= 3:  # Found at least 3 property-related columns
-                                st.success(f"✅ Found proper headers in row {header_row + 1}")
-                                return df_test
+                        if matches >= 3:  # Found at least 3 property-related columns
+                            st.success(f"✅ Found proper headers in row {header_row + 1}")
+                            return xl.parse(0, header=header_row)
 
-                    except Exception as e:
-                        continue
+                df_default = xl.parse(0)
 
                 # If no better header found, try to use the first data row as headers
                 if len(df_default) > 1:
                     try:
                         # Use the first data row as column names
                         new_columns = df_default.iloc[0].fillna('Unknown').astype(str).tolist()
-                        df_fixed = df_default.iloc[1:].copy()
+                        df_fixed = df_default.iloc[1:]
                         df_fixed.columns = new_columns
                         df_fixed = df_fixed.reset_index(drop=True)
 
@@ -201,7 +349,9 @@ class DocumentProcessor:
                     except Exception as e:
                         st.warning(f"Could not fix headers automatically: {e}")
 
-            return df_default
+                return df_default
+
+            return xl.parse(0)
 
         except Exception as e:
             st.error(f"Error loading Excel file with smart headers: {str(e)}")
@@ -232,18 +382,22 @@ class DocumentProcessor:
             "Distance (km) to CBD", "Population"
         ]
 
+        # Normalize every column name once rather than once per critical field
+        normalized_columns = [_normalize_column_name(col) for col in df.columns]
+
         missing_fields = []
         for field in critical_fields:
             if field not in df.columns:
                 # Try to find similar columns
-                similar_cols = [col for col in df.columns if field.lower().replace(" ", "").replace("(", "").replace(")", "") in col.lower().replace(" ", "").replace("(", "").replace(")", "")]
-                if not similar_cols:
+                normalized_field = _normalize_column_name(field)
+                if not any(normalized_field in col for col in normalized_columns):
                     missing_fields.append(field)
 
         validation_results["missing_critical_fields"] = missing_fields
 
-        # Check data quality
-        if df.isnull().sum().sum() > (len(df) * len(df.columns) * 0.3):
+        # Check data quality; large frames are estimated from an evenly strided row sample
+        sample = df.iloc[::max(1, len(df) // VALIDATION_SAMPLE_ROWS)]
+        if sample.isna().to_numpy().mean() > 0.3:
             validation_results["data_quality_issues"].append("High percentage of missing values (>30%)")
 
         # Check for reasonable data ranges (with more lenient criteria)
@@ -278,35 +432,80 @@ class DocumentProcessor:
 
     @staticmethod
     def clean_suburb_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and standardize suburb data"""
+        """Clean and standardize suburb data; modifies df in place"""
         if df is None or df.empty:
             return df
 
-        df_cleaned = df.copy()
+        df_cleaned = df
 
         # Remove completely empty rows
-        df_cleaned = df_cleaned.dropna(how='all')
+        df_cleaned.dropna(how='all', inplace=True)
 
         # Clean suburb names
         if 'Suburb' in df_cleaned.columns:
-            df_cleaned['Suburb'] = df_cleaned['Suburb'].astype(str).str.strip().str.title()
+            # Title-case each distinct name once and broadcast back through the codes
+            codes, suburbs = pd.factorize(df_cleaned['Suburb'].astype(str))
+            df_cleaned['Suburb'] = suburbs.str.strip().str.title()[codes]
 
-        # Clean numeric columns
+        # Clean numeric columns as one block rather than column by column
         numeric_columns = df_cleaned.select_dtypes(include=['number']).columns
-        for col in numeric_columns:
-            # Remove outliers (values beyond 3 standard deviations)
-            mean_val = df_cleaned[col].mean()
-            std_val = df_cleaned[col].std()
-            if not pd.isna(std_val) and std_val > 0:
-                df_cleaned[col] = df_cleaned[col].clip(
-                    lower=mean_val - 3*std_val,
-                    upper=mean_val + 3*std_val
-                )
+        if len(numeric_columns) == 0:
+            return df_cleaned
+
+        block = df_cleaned[numeric_columns]
+
+        # Remove outliers (values beyond 3 standard deviations); constant or
+        # single-value columns have no usable spread and are left as they are
+        means = block.mean()
+        stds = block.std()
+        clippable = stds.notna() & (stds > 0)
+        if clippable.any():
+            # Unbounded limits leave the other columns untouched without a partial copy
+            block = block.clip(
+                lower=(means - 3 * stds).where(clippable, -np.inf),
+                upper=(means + 3 * stds).where(clippable, np.inf),
+                axis=1
+            )
 
         # Fill missing values with median for numeric columns
-        for col in numeric_columns:
-            if df_cleaned[col].isnull().sum() > 0:
-                median_val = df_cleaned[col].median()
-                df_cleaned[col] = df_cleaned[col].fillna(median_val)
+        df_cleaned[numeric_columns] = block.fillna(block.median())
+
+        return df_cleaned
+
+
+@st.cache_data(show_spinner=False, max_entries=UPLOAD_CACHE_MAX_ENTRIES, ttl=UPLOAD_CACHE_TTL_SECONDS)
+def _extract_document_text(name: str, data: bytes) -> str:
+    """Extract text from a document's raw bytes; cached per file content"""
+    file_extension = name.lower().split('.')[-1]
+    file_buffer = BytesIO(data)
+
+    if file_extension == 'docx':
+        return DocumentProcessor.extract_text_from_docx(file_buffer)
+    if file_extension == 'pdf':
+        return DocumentProcessor.extract_text_from_pdf(file_buffer)
+    return DocumentProcessor.extract_text_from_txt(file_buffer)
+
+
+@st.cache_data(show_spinner=False, max_entries=UPLOAD_CACHE_MAX_ENTRIES, ttl=UPLOAD_CACHE_TTL_SECONDS)
+def _load_data_bytes(name: str, data: bytes) -> Optional[pd.DataFrame]:
+    """Load a CSV or Excel file from its raw bytes; cached per file content"""
+    file_extension = name.lower().split('.')[-1]
+
+    try:
+        if file_extension == 'csv':
+            try:
+                # Multithreaded pyarrow parser; the C parser copes with what it rejects
+                df = pd.read_csv(BytesIO(data), engine='pyarrow')
+            except Exception:
+                df = pd.read_csv(BytesIO(data))
+        elif file_extension in ['xlsx', 'xls']:
+            df = DocumentProcessor._load_excel_with_smart_headers(BytesIO(data))
+        else:
+            st.error(f"Unsupported data file format: {file_extension}")
+            return None
+
+        return df
 
-        return df_cleaned
\ No newline at end of file
+    except Exception as e:
+        st.error(f"Error loading data file: {str(e)}")
+        return None
\ No newline at end of file
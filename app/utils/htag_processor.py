@@ -3,6 +3,7 @@ import numpy as np
 import streamlit as st
 from typing import Optional, Dict, Any
 import re
+import difflib
 
 class HtAGProcessor:
     """
@@ -10,31 +11,31 @@ class HtAGProcessor:
     Automatically converts raw HtAG export files into standardized format
     """
 
+    # Currency, thousands separators, percent signs and whitespace in numeric cells
+    _NUMERIC_NOISE_RE = re.compile(r'[$,%\s]')
+    # Cells that may hold a range ('500000-600000', '3 to 4') rather than a single value;
+    # whitespace is already stripped when this runs, so 'to' has no spaces around it
+    _RANGE_HINT_RE = re.compile(r'-|to', re.IGNORECASE)
+    # A full two-number range, capturing both ends
+    _RANGE_RE = re.compile(r'^\s*([-+]?\d*\.?\d+)\s*(?:-|to)\s*([-+]?\d*\.?\d+)\s*$', re.IGNORECASE)
+    # Standard column names for detected fields; other detected fields keep their own names
+    _CANONICAL_COLUMNS = {
+        'suburb': 'Suburb',
+        'state': 'State',
+        'median_price': 'Median Price',
+        'rental_yield': 'Rental Yield on Houses',
+        'distance_cbd': 'Distance (km) to CBD',
+        'population': 'Population',
+    }
+
     def __init__(self):
         self.required_columns = [
             'Suburb', 'State', 'Median Price', 'Rental Yield on Houses',
             'Distance (km) to CBD', 'Population'
         ]
 
-    def detect_htag_format(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Detect if uploaded file is HtAG format and identify column mappings"""
-
-        detection_result = {
-            'is_htag': False,
-            'format_type': 'unknown',
-            'column_mappings': {},
-            'confidence': 0.0,
-            'issues': []
-        }
-
-        if df is None or df.empty:
-            detection_result['issues'].append("Empty dataframe")
-            return detection_result
-
-        columns = [col.lower().strip() for col in df.columns]
-
         # HtAG column patterns to look for (enhanced for real HtAG files)
-        htag_patterns = {
+        self.htag_patterns = {
             'suburb': [
                 'suburb', 'suburb name', 'location', 'area',
                 'suburb_name', 'suburb-name'
@@ -63,42 +64,73 @@ class HtAGProcessor:
             ]
         }
 
-        # Try to match columns
+        # Flattened once so detection is a dict lookup per column
+        self._pattern_index = {
+            pattern: standard_name
+            for standard_name, patterns in self.htag_patterns.items()
+            for pattern in patterns
+        }
+
+    def detect_htag_format(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Detect if uploaded file is HtAG format and identify column mappings"""
+
+        detection_result = {
+            'is_htag': False,
+            'format_type': 'unknown',
+            'column_mappings': {},
+            'confidence': 0.0,
+            'issues': []
+        }
+
+        if df is None or df.empty:
+            detection_result['issues'].append("Empty dataframe")
+            return detection_result
+
+        # Map normalized names back to the first original column that produced them
+        original_columns = {}
+        for orig_col in df.columns:
+            original_columns.setdefault(str(orig_col).lower().strip(), orig_col)
+
+        # Exact matches are a single hash lookup per column
         matched_columns = {}
-        confidence_score = 0
+        scores = {}
+        for col in original_columns:
+            standard_name = self._pattern_index.get(col)
+            if standard_name and standard_name not in matched_columns:
+                matched_columns[standard_name] = original_columns[col]
+                scores[standard_name] = 1.0
+                if len(matched_columns) == len(self.htag_patterns):
+                    break
+
+        # Fuzzy fallback only for the standards still unmatched; skipped outright
+        # when every standard already has an exact match
+        remaining = []
+        if len(matched_columns) < len(self.htag_patterns):
+            claimed = set(matched_columns.values())
+            remaining = [col for col, orig_col in original_columns.items() if orig_col not in claimed]
+        for standard_name, patterns in self.htag_patterns.items():
+            if not remaining:
+                break
+            if standard_name in matched_columns:
+                continue
 
-        for standard_name, patterns in htag_patterns.items():
             best_match = None
             best_score = 0
-
-            for col in columns:
-                for pattern in patterns:
-                    # Exact match
-                    if col == pattern:
+            for pattern in patterns:
+                for col in difflib.get_close_matches(pattern, remaining, n=1, cutoff=0.6):
+                    score = difflib.SequenceMatcher(None, pattern, col).ratio()
+                    if score > best_score:
                         best_match = col
-                        best_score = 1.0
-                        break
-                    # Partial match
-                    elif pattern in col or col in pattern:
-                        score = len(pattern) / max(len(col), len(pattern))
-                        if score > best_score and score > 0.6:
-                            best_match = col
-                            best_score = score
-
-            if best_match and best_score > 0.6:
-                # Find original column name (with proper case)
-                original_col = None
-                for orig_col in df.columns:
-                    if orig_col.lower().strip() == best_match:
-                        original_col = orig_col
-                        break
-
-                if original_col:
-                    matched_columns[standard_name] = original_col
-                    confidence_score += best_score
+                        best_score = score
+
+            if best_match:
+                matched_columns[standard_name] = original_columns[best_match]
+                scores[standard_name] = best_score
+
+        confidence_score = sum(scores.values())
 
         # Calculate overall confidence
-        total_required = len(htag_patterns)
+        total_required = len(self.htag_patterns)
         detection_result['confidence'] = confidence_score / total_required
 
         # Determine if this is likely HtAG format
@@ -130,26 +162,17 @@ class HtAGProcessor:
         try:
             st.info("🔄 Processing HtAG data...")
 
-            processed_df = df.copy()
+            # rename() hands back a new frame, so the caller's df is never touched
             column_mappings = detection_result['column_mappings']
 
             # Step 1: Rename columns to standard names
-            rename_mapping = {}
-            for standard_name, original_col in column_mappings.items():
-                if standard_name == 'suburb':
-                    rename_mapping[original_col] = 'Suburb'
-                elif standard_name == 'state':
-                    rename_mapping[original_col] = 'State'
-                elif standard_name == 'median_price':
-                    rename_mapping[original_col] = 'Median Price'
-                elif standard_name == 'rental_yield':
-                    rename_mapping[original_col] = 'Rental Yield on Houses'
-                elif standard_name == 'distance_cbd':
-                    rename_mapping[original_col] = 'Distance (km) to CBD'
-                elif standard_name == 'population':
-                    rename_mapping[original_col] = 'Population'
-
-            processed_df = processed_df.rename(columns=rename_mapping)
+            rename_mapping = {
+                original_col: self._CANONICAL_COLUMNS[standard_name]
+                for standard_name, original_col in column_mappings.items()
+                if standard_name in self._CANONICAL_COLUMNS
+            }
+
+            processed_df = df.rename(columns=rename_mapping)
             st.success(f"✅ Renamed {len(rename_mapping)} columns")
 
             # Step 2: Clean and standardize data
@@ -177,18 +200,22 @@ class HtAGProcessor:
             return None
 
     def _clean_htag_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and standardize HtAG data"""
+        """Clean and standardize HtAG data; modifies df in place"""
 
-        cleaned_df = df.copy()
+        cleaned_df = df
 
         # Clean suburb names
+        # Suburb and State repeat heavily, so the string work runs on the distinct
+        # values only and is broadcast back through the factorize codes
         if 'Suburb' in cleaned_df.columns:
-            cleaned_df['Suburb'] = cleaned_df['Suburb'].astype(str).str.strip().str.title()
-            cleaned_df['Suburb'] = cleaned_df['Suburb'].replace(['Nan', 'None', ''], np.nan)
+            codes, suburbs = pd.factorize(cleaned_df['Suburb'].astype(str))
+            suburbs = suburbs.str.strip().str.title()
+            cleaned_df['Suburb'] = suburbs.where(~suburbs.isin(['Nan', 'None', '']), np.nan)[codes]
 
         # Clean state names
         if 'State' in cleaned_df.columns:
-            cleaned_df['State'] = cleaned_df['State'].astype(str).str.strip().str.upper()
+            codes, states = pd.factorize(cleaned_df['State'].astype(str))
+            states = states.str.strip().str.upper()
             # Standardize state abbreviations
             state_mapping = {
                 'NEW SOUTH WALES': 'NSW',
@@ -200,7 +227,7 @@ class HtAGProcessor:
                 'NORTHERN TERRITORY': 'NT',
                 'AUSTRALIAN CAPITAL TERRITORY': 'ACT'
             }
-            cleaned_df['State'] = cleaned_df['State'].replace(state_mapping)
+            cleaned_df['State'] = states.map(lambda state: state_mapping.get(state, state))[codes]
 
         # Clean numeric columns (including percentage columns)
         numeric_columns = [
@@ -213,61 +240,42 @@ class HtAGProcessor:
             if col in cleaned_df.columns:
                 # Remove currency symbols, commas, and percentage signs
                 if cleaned_df[col].dtype == 'object':
-                    cleaned_df[col] = cleaned_df[col].astype(str)
-                    cleaned_df[col] = cleaned_df[col].str.replace('$', '', regex=False)
-                    cleaned_df[col] = cleaned_df[col].str.replace(',', '', regex=False)
-                    cleaned_df[col] = cleaned_df[col].str.replace('%', '', regex=False)
-                    cleaned_df[col] = cleaned_df[col].str.replace(' ', '', regex=False)
+                    values = cleaned_df[col].astype(str).str.replace(self._NUMERIC_NOISE_RE, '', regex=True)
 
-                    # Handle ranges (take average)
-                    cleaned_df[col] = cleaned_df[col].apply(self._handle_range_values)
+                    # Handle ranges (take average), only on the cells that look like one
+                    range_mask = values.str.contains(self._RANGE_HINT_RE, na=False)
+                    if range_mask.any():
+                        values.loc[range_mask] = values.loc[range_mask].map(self._handle_range_values)
+                    cleaned_df[col] = values
 
                 # Convert to numeric
                 cleaned_df[col] = pd.to_numeric(cleaned_df[col], errors='coerce')
 
         # Remove completely empty rows
-        cleaned_df = cleaned_df.dropna(how='all')
+        cleaned_df.dropna(how='all', inplace=True)
 
         # Remove rows where suburb is missing
         if 'Suburb' in cleaned_df.columns:
-            cleaned_df = cleaned_df.dropna(subset=['Suburb'])
+            cleaned_df.dropna(subset=['Suburb'], inplace=True)
 
         return cleaned_df
 
     def _handle_range_values(self, value):
         """Handle range values like '500,000 - 600,000' by taking the average"""
 
-        if pd.isna(value) or value in ['', 'nan', 'None']:
-            return np.nan
-
-        value_str = str(value).strip()
-
-        # Check for range patterns
-        if '-' in value_str:
-            parts = value_str.split('-')
-            if len(parts) == 2:
-                try:
-                    min_val = float(parts[0].strip())
-                    max_val = float(parts[1].strip())
-                    return (min_val + max_val) / 2
-                except:
-                    pass
-
-        # Check for 'to' patterns
-        if ' to ' in value_str.lower():
-            parts = value_str.lower().split(' to ')
-            if len(parts) == 2:
-                try:
-                    min_val = float(parts[0].strip())
-                    max_val = float(parts[1].strip())
-                    return (min_val + max_val) / 2
-                except:
-                    pass
+        if not isinstance(value, str):
+            if pd.isna(value):
+                return np.nan
+            value = str(value)
+
+        match = self._RANGE_RE.match(value)
+        if match:
+            return (float(match.group(1)) + float(match.group(2))) / 2
 
         return value
 
     def _add_missing_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add missing standard columns with appropriate defaults"""
+        """Add missing standard columns with appropriate defaults; modifies df in place"""
 
         standard_columns = {
             'Suburb': 'Unknown',
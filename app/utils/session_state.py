@@ -1,10 +1,38 @@
 import streamlit as st
 import json
 import pickle
-import base64
+import time
 from datetime import datetime
+from io import StringIO
 import pandas as pd
 
+# Session keys with immutable defaults, set once per session. Mutable and
+# time-based defaults are created per session in initialize_session_state
+SESSION_DEFAULTS = {
+    # Navigation
+    'current_page': 'home',
+    'workflow_step': 1,
+    # Customer profile
+    'profile_generated': False,
+    # Data upload
+    'suburb_data': None,
+    'data_uploaded': False,
+    # Analysis
+    'filtered_suburbs': None,
+    'recommendations': None,
+    'analysis_complete': False,
+    # Reports
+    'final_report': None,
+    # Session persistence flags
+    'session_backup_available': False,
+}
+
+# Values reset_session_state writes back; customer_profile gets a fresh dict per reset
+RESET_DEFAULTS = {
+    **SESSION_DEFAULTS,
+    'session_backup': None,
+}
+
 def initialize_session_state():
     """Initialize session state variables with persistence and recovery"""
 
@@ -12,47 +40,14 @@ def initialize_session_state():
     if 'session_id' not in st.session_state:
         st.session_state.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    # Navigation
-    if 'current_page' not in st.session_state:
-        st.session_state.current_page = 'home'
-
-    if 'workflow_step' not in st.session_state:
-        st.session_state.workflow_step = 1
-
-    # Customer profile with persistence check
-    if 'customer_profile' not in st.session_state:
-        st.session_state.customer_profile = {}
+    for key, value in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
 
-    if 'profile_generated' not in st.session_state:
-        st.session_state.profile_generated = False
-
-    # Data upload with persistence check
-    if 'suburb_data' not in st.session_state:
-        st.session_state.suburb_data = None
-
-    if 'data_uploaded' not in st.session_state:
-        st.session_state.data_uploaded = False
-
-    # Analysis with persistence check
-    if 'filtered_suburbs' not in st.session_state:
-        st.session_state.filtered_suburbs = None
-
-    if 'recommendations' not in st.session_state:
-        st.session_state.recommendations = None
-
-    if 'analysis_complete' not in st.session_state:
-        st.session_state.analysis_complete = False
-
-    # Reports
-    if 'final_report' not in st.session_state:
-        st.session_state.final_report = None
-
-    # Session persistence flags
-    if 'session_backup_available' not in st.session_state:
-        st.session_state.session_backup_available = False
+    # A fresh dict per session, so sessions never share one profile object
+    st.session_state.setdefault('customer_profile', {})
 
     if 'last_activity' not in st.session_state:
-        st.session_state.last_activity = datetime.now()
+        st.session_state.last_activity = time.monotonic_ns()
 
     # Auto-recover on initialization
     if not st.session_state.get('session_initialized', False):
@@ -68,6 +63,39 @@ def initialize_session_state():
        not st.session_state.get('session_backup_available', False):
         backup_session_data()
 
+def _serialize_frame(df):
+    """Serialize a DataFrame for the session backup: Arrow IPC bytes, or JSON text
+    when a column holds values Arrow cannot type (mixed objects)"""
+    import pyarrow as pa
+
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return df.to_json()
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def _deserialize_frame(data):
+    """Rebuild a DataFrame stored by _serialize_frame"""
+    if isinstance(data, str):
+        return pd.read_json(StringIO(data))
+
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+def _frame_signature(df):
+    """Content fingerprint of a DataFrame (labels, dtypes and values), or None when
+    a column holds unhashable values"""
+    try:
+        values_hash = int(pd.util.hash_pandas_object(df).sum())
+    except TypeError:
+        return None
+    return (df.shape, tuple(map(str, df.columns)), tuple(map(str, df.dtypes)), values_hash)
+
 def backup_session_data():
     """Create a backup of current session data using browser localStorage simulation"""
     try:
@@ -85,8 +113,16 @@ def backup_session_data():
         # Handle DataFrame serialization for suburb_data
         if st.session_state.get('suburb_data') is not None:
             try:
-                # Convert DataFrame to JSON-serializable format
-                backup_data['suburb_data_json'] = st.session_state.suburb_data.to_json()
+                # Reuse the previous encoding when the frame has not changed since the last backup
+                suburb_data = st.session_state.suburb_data
+                signature = _frame_signature(suburb_data)
+                previous = st.session_state.get('session_backup') or {}
+                if signature is not None and previous.get('suburb_data_signature') == signature:
+                    backup_data['suburb_data_serialized'] = previous['suburb_data_serialized']
+                else:
+                    # Arrow IPC keeps the frame columnar instead of formatting every cell as text
+                    backup_data['suburb_data_serialized'] = _serialize_frame(suburb_data)
+                backup_data['suburb_data_signature'] = signature
                 backup_data['has_suburb_data'] = True
             except Exception as e:
                 st.warning(f"Could not backup suburb data: {e}")
@@ -95,19 +131,13 @@ def backup_session_data():
         # Handle recommendations data
         if st.session_state.get('recommendations') is not None:
             try:
-                # Serialize recommendations (can be dict or DataFrame)
-                recs = st.session_state.recommendations
-                if isinstance(recs, dict):
-                    # Handle DataFrame values in dict
-                    serialized_recs = {}
-                    for key, value in recs.items():
-                        if isinstance(value, pd.DataFrame):
-                            serialized_recs[key] = value.to_json()
-                        else:
-                            serialized_recs[key] = value
-                    backup_data['recommendations'] = serialized_recs
-                else:
-                    backup_data['recommendations'] = str(recs)  # Fallback
+                # Pickle protocol 5 hands the NumPy buffers behind any DataFrames out of
+                # band, so they are copied as raw bytes instead of re-encoded
+                buffers = []
+                backup_data['recommendations_pkl'] = pickle.dumps(
+                    st.session_state.recommendations, protocol=5, buffer_callback=buffers.append
+                )
+                backup_data['recommendations_bufs'] = [bytes(buffer) for buffer in buffers]
                 backup_data['has_recommendations'] = True
             except Exception as e:
                 st.warning(f"Could not backup recommendations: {e}")
@@ -116,7 +146,7 @@ def backup_session_data():
         # Store in session state for persistence across page changes
         st.session_state.session_backup = backup_data
         st.session_state.session_backup_available = True
-        st.session_state.last_activity = datetime.now()
+        st.session_state.last_activity = time.monotonic_ns()
 
         return True
     except Exception as e:
@@ -138,30 +168,20 @@ def recover_session_data():
         st.session_state.analysis_complete = backup_data.get('analysis_complete', False)
 
         # Restore suburb data
-        if backup_data.get('has_suburb_data', False) and 'suburb_data_json' in backup_data:
+        if backup_data.get('has_suburb_data', False) and 'suburb_data_serialized' in backup_data:
             try:
-                st.session_state.suburb_data = pd.read_json(backup_data['suburb_data_json'])
+                st.session_state.suburb_data = _deserialize_frame(backup_data['suburb_data_serialized'])
             except Exception as e:
                 st.warning(f"Could not restore suburb data: {e}")
 
         # Restore recommendations
-        if backup_data.get('has_recommendations', False) and 'recommendations' in backup_data:
+        if backup_data.get('has_recommendations', False) and 'recommendations_pkl' in backup_data:
             try:
-                recs_data = backup_data['recommendations']
-                if isinstance(recs_data, dict):
-                    # Deserialize DataFrames in the dict
-                    restored_recs = {}
-                    for key, value in recs_data.items():
-                        if isinstance(value, str) and key.endswith('_recommendations'):
-                            try:
-                                restored_recs[key] = pd.read_json(value)
-                            except:
-                                restored_recs[key] = value
-                        else:
-                            restored_recs[key] = value
-                    st.session_state.recommendations = restored_recs
-                else:
-                    st.session_state.recommendations = recs_data
+                # Writable copies, so the restored frames can be modified in place
+                st.session_state.recommendations = pickle.loads(
+                    backup_data['recommendations_pkl'],
+                    buffers=[bytearray(buffer) for buffer in backup_data['recommendations_bufs']]
+                )
             except Exception as e:
                 st.warning(f"Could not restore recommendations: {e}")
 
@@ -177,18 +197,9 @@ def update_workflow_step(step):
 
 def reset_session_state():
     """Reset all session state variables"""
-    keys_to_reset = [
-        'customer_profile', 'profile_generated', 'suburb_data', 'data_uploaded',
-        'filtered_suburbs', 'recommendations', 'analysis_complete', 'final_report',
-        'session_backup', 'session_backup_available'
-    ]
-
-    for key in keys_to_reset:
-        if key in st.session_state:
-            del st.session_state[key]
-
-    st.session_state.workflow_step = 1
-    st.session_state.current_page = 'home'
+    # One batch write back to the defaults; deleted keys would only be re-created
+    # by initialize_session_state on the next rerun
+    st.session_state.update(RESET_DEFAULTS, customer_profile={})
 
 def get_workflow_progress():
     """Get the current workflow progress as percentage"""
@@ -215,6 +226,7 @@ def save_recommendations(recommendations):
 
 def get_session_status():
     """Get current session status for debugging"""
+    last_activity = st.session_state.get('last_activity')
     return {
         'session_id': st.session_state.get('session_id', 'N/A'),
         'workflow_step': st.session_state.get('workflow_step', 1),
@@ -222,5 +234,6 @@ def get_session_status():
         'data_uploaded': st.session_state.get('data_uploaded', False),
         'analysis_complete': st.session_state.get('analysis_complete', False),
         'backup_available': st.session_state.get('session_backup_available', False),
-        'last_activity': st.session_state.get('last_activity', 'N/A')
+        # last_activity is a monotonic_ns stamp; report how long ago it was
+        'last_activity_s_ago': (time.monotonic_ns() - last_activity) / 1e9 if isinstance(last_activity, int) else 'N/A'
     }
\ No newline at end of file
@@ -6,183 +6,302 @@ import pandas as pd
 import numpy as np
 import re
 import sys
+from openpyxl import load_workbook
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Row holding the column names in an HtAG dashboard export (1-based, as in Excel)
+HTAG_HEADER_ROW = 3
+
+# Numeric source columns, coerced together before mapping
+HTAG_NUMERIC_COLUMNS = [
+    'Price', 'Yield', 'Population', 'Nearest GPO', 'Vacancy Rate', 'DoM',
+    'PΔ10Y', 'Capital Growth', 'GRC Index', 'PΔ5Y', 'PΔ3Y'
+]
+
+# Growth columns in order of preference; the first one present is used
+HTAG_GROWTH_COLUMNS = ['PΔ10Y', 'Capital Growth', 'GRC Index', 'PΔ5Y', 'PΔ3Y']
+
+# Source columns the converter reads; everything else in the export is skipped
+HTAG_COLUMNS = ['State', 'SA4'] + HTAG_NUMERIC_COLUMNS
+
+# "Suburb Name, STATE postcode": the suburb runs to the first comma, the state is the
+# first 2-3 letter code after a comma that is followed by a postcode
+AREA_RE = re.compile(r'^(?P<suburb>[^,]+)(?:.*?,\s*(?P<state>\w{2,3})\s+\d+)?', re.DOTALL)
+
+STATES = frozenset({'NSW', 'VIC', 'QLD', 'SA', 'WA', 'TAS', 'NT', 'ACT'})
+
+def annualize(total_growth, years):
+    """Annual growth in percent from cumulative growth over `years` (0.5 = +50%)"""
+    # expm1/log1p is (1 + g) ** (1 / years) - 1 in one pass, and exact for small g;
+    # growth below -100% has no annual rate and comes out as NaN
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.expm1(np.log1p(total_growth) / years) * 100.0
+
+def write_csv(df, output_file):
+    """Write df as CSV without the index, using Arrow's C++ writer when possible"""
+    if PYARROW_AVAILABLE:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass  # mixed-type object column; pandas can still write it
+        else:
+            pa_csv.write_csv(table, output_file)
+            return
+
+    df.to_csv(output_file, index=False)
+
+def read_htag_sheet(input_file):
+    """Stream the first sheet of an HtAG export and keep only the columns the converter uses
 
-def convert_htag_data(input_file, output_file=None):
-    """Convert HtAG Analytics data to Property Finder format"""
+    Returns the DataFrame and the full list of column names in the sheet.
+    """
+    workbook = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(min_row=HTAG_HEADER_ROW, values_only=True)
+        header = list(next(rows, ()))
+        while header and header[-1] is None:
+            header.pop()
+        column_names = [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header)]
+
+        # The first column plus the first 'area' column are suburb candidates
+        wanted = {}
+        if column_names:
+            wanted[column_names[0]] = 0
+        for i, name in enumerate(column_names):
+            if 'area' in name.lower():
+                wanted.setdefault(name, i)
+                break
+        for name in HTAG_COLUMNS:
+            if name in column_names:
+                wanted.setdefault(name, column_names.index(name))
+
+        columns = {name: [] for name in wanted}
+        picks = list(wanted.items())
+        row_count = 0
+        last_data_row = 0
+        for row in rows:
+            row_count += 1
+            width = len(row)
+            for name, i in picks:
+                columns[name].append(row[i] if i < width else None)
+            if row.count(None) != width:
+                last_data_row = row_count
+    finally:
+        workbook.close()
+
+    # Trailing blank rows are dropped, as pandas does; blank rows inside the data are kept
+    df = pd.DataFrame({name: values[:last_data_row] for name, values in columns.items()})
+    return df, column_names
+
+def convert_htag_data(input_file, output_file=None, verbose=True):
+    """Convert HtAG Analytics data to Property Finder format
+
+    With verbose=False only errors are printed, and the diagnostic summary is skipped.
+    """
 
     try:
-        print("🔄 Reading HtAG Analytics file...")
+        if verbose:
+            print("🔄 Reading HtAG Analytics file...")
 
-        # Read with correct header row (row 2, 0-indexed)
-        df = pd.read_excel(input_file, header=2)
+        # Stream only the columns used below; HtAG exports carry hundreds more
+        df, all_columns = read_htag_sheet(input_file)
 
-        print(f"✅ Loaded {len(df)} rows with {len(df.columns)} columns")
+        if verbose:
+            print(f"✅ Loaded {len(df)} rows with {len(all_columns)} columns")
+
+        # Column presence checks below are set lookups
+        columns = set(df.columns)
 
         # Debug: show actual column names
-        print("🔍 Available columns:")
-        for i, col in enumerate(df.columns[:20]):  # Show first 20 columns
-            print(f"  {i+1:2d}. {col}")
-        if len(df.columns) > 20:
-            print(f"     ... and {len(df.columns) - 20} more")
+        if verbose:
+            print("🔍 Available columns:")
+            for i, col in enumerate(all_columns[:20]):  # Show first 20 columns
+                print(f"  {i+1:2d}. {col}")
+            if len(all_columns) > 20:
+                print(f"     ... and {len(all_columns) - 20} more")
 
         # Find the area/suburb column (it might not be exactly 'Area')
-        area_column = None
-        for col in df.columns:
-            if 'area' in col.lower() or col.strip().lower() == 'area':
-                area_column = col
-                break
+        area_matches = df.columns[df.columns.str.contains('area', case=False, regex=False)]
+        area_column = area_matches[0] if len(area_matches) else None
 
         # If no 'Area' column found, check the first column
         if area_column is None and len(df.columns) > 0:
             # Check if first column contains suburb-like data
             first_col = df.columns[0]
             sample_value = str(df[first_col].iloc[0]) if not df[first_col].empty else ""
-            if ',' in sample_value and any(state in sample_value.upper() for state in ['NSW', 'VIC', 'QLD', 'SA', 'WA', 'TAS', 'NT', 'ACT']):
+            if ',' in sample_value and STATES.intersection(re.findall(r'[A-Z]+', sample_value.upper())):
                 area_column = first_col
-                print(f"📍 Using '{first_col}' as suburb column")
+                if verbose:
+                    print(f"📍 Using '{first_col}' as suburb column")
 
         if area_column is None:
             raise ValueError("Could not find suburb/area column in the data")
 
-        print(f"🏘️  Processing suburb and state data from column: '{area_column}'")
+        if verbose:
+            print(f"🏘️  Processing suburb and state data from column: '{area_column}'")
 
         # Extract suburb and state from area column
         # Area format is typically: "Suburb Name, STATE postcode"
-        df['Suburb_Clean'] = df[area_column].str.extract(r'^([^,]+)')
-        df['State_Clean'] = df[area_column].str.extract(r',\s*(\w{2,3})\s+\d+')
+        extracted = df[area_column].str.extract(AREA_RE)
+        df['Suburb_Clean'] = extracted['suburb']
+        states = extracted['state'].str.upper()
+        unrecognised = states.notna() & ~states.isin(STATES)
+
+        # A missing state falls back to the export's State column, or NSW. An unrecognised
+        # code can only be recovered from the State column; otherwise it stays empty and
+        # the row is dropped with the other incomplete rows
+        if 'State' in columns:
+            df['State_Clean'] = states.mask(unrecognised).fillna(df['State'])
+        else:
+            df['State_Clean'] = states.fillna('NSW').mask(unrecognised)
 
-        # Handle cases where state might not be extracted properly
-        df['State_Clean'] = df['State_Clean'].fillna(df['State'] if 'State' in df.columns else 'NSW')
+        if verbose and unrecognised.any():
+            action = "taken from the State column" if 'State' in columns else "dropped"
+            print(f"⚠️  {int(unrecognised.sum())} row(s) with an unrecognised state code; {action}")
 
         # Create the converted dataframe with required columns
         converted_df = pd.DataFrame()
 
         # Map columns according to Property Finder requirements
-        print("🗺️  Mapping columns...")
+        if verbose:
+            print("🗺️  Mapping columns...")
 
         converted_df['Suburb'] = df['Suburb_Clean'].str.strip()
         converted_df['State'] = df['State_Clean'].str.strip().str.upper()
-        converted_df['Region'] = df['SA4'] if 'SA4' in df.columns else 'Unknown'
+        converted_df['Region'] = df['SA4'] if 'SA4' in columns else 'Unknown'
+
+        # Coerce every numeric source column in one sweep; the mapping below reads from it
+        numeric_sources = [col for col in HTAG_NUMERIC_COLUMNS if col in columns]
+        numeric = df[numeric_sources].apply(pd.to_numeric, errors='coerce')
 
         # Price data
-        converted_df['Median Price'] = pd.to_numeric(df['Price'], errors='coerce')
+        converted_df['Median Price'] = numeric['Price']
 
         # Rental yield (convert from decimal to percentage)
-        yield_values = pd.to_numeric(df['Yield'], errors='coerce')
-        # If values are in decimal format (0.04 = 4%), convert to percentage
-        if yield_values.max() < 1:
-            yield_values = yield_values * 100
+        # An owned float copy: under copy-on-write the column's own array is read-only
+        yield_values = numeric['Yield'].to_numpy(dtype=np.float64, copy=True)
+        # If values are in decimal format (0.04 = 4%), convert to percentage;
+        # fmax.reduce skips NaN like Series.max, and the scaling reuses the buffer
+        if yield_values.size and np.fmax.reduce(yield_values) < 1:
+            np.multiply(yield_values, 100, out=yield_values)
         converted_df['Rental Yield on Houses'] = yield_values
 
         # Distance to CBD - try to find appropriate column
-        if 'Nearest GPO' in df.columns:
-            converted_df['Distance (km) to CBD'] = pd.to_numeric(df['Nearest GPO'], errors='coerce')
+        if 'Nearest GPO' in columns:
+            converted_df['Distance (km) to CBD'] = numeric['Nearest GPO']
         else:
             # Estimate based on region or set default
             converted_df['Distance (km) to CBD'] = 25  # Default estimate
 
         # Population
-        converted_df['Population'] = pd.to_numeric(df['Population'], errors='coerce')
+        converted_df['Population'] = numeric['Population']
 
         # Additional useful columns if available
-        if 'Vacancy Rate' in df.columns:
-            converted_df['Vacancy Rate'] = pd.to_numeric(df['Vacancy Rate'], errors='coerce')
-
-        if 'DoM' in df.columns:
-            converted_df['Sales Days on Market'] = pd.to_numeric(df['DoM'], errors='coerce')
-
-        # Growth rate - try multiple possible column names in order of preference
-        growth_rate_found = False
-
-        # Try PΔ10Y first (10-year price delta) - convert from decimal to percentage
-        if 'PΔ10Y' in df.columns:
-            growth_values = pd.to_numeric(df['PΔ10Y'], errors='coerce')
-            # Convert from cumulative 10-year growth to annual rate
-            # Formula: annual_rate = (1 + total_growth)^(1/10) - 1
-            annual_growth = ((1 + growth_values) ** (1/10) - 1) * 100
-            converted_df['10 yr Avg. Annual Growth'] = annual_growth
-            growth_rate_found = True
-            print(f"✅ Using 'PΔ10Y' for growth rate (converted to annual %)")
-
-        # Try Capital Growth as a score/index
-        elif 'Capital Growth' in df.columns:
-            cg_values = pd.to_numeric(df['Capital Growth'], errors='coerce')
+        if 'Vacancy Rate' in columns:
+            converted_df['Vacancy Rate'] = numeric['Vacancy Rate']
+
+        if 'DoM' in columns:
+            converted_df['Sales Days on Market'] = numeric['DoM']
+
+        # Growth rate - the first available column in order of preference
+        growth_column = next((col for col in HTAG_GROWTH_COLUMNS if col in columns), None)
+        growth_rate_found = growth_column is not None
+
+        if growth_column == 'Capital Growth':
+            cg_values = numeric['Capital Growth']
             # Assume Capital Growth is a score out of 100, convert to estimated annual %
             # Higher scores suggest better growth potential
             estimated_growth = 2.0 + (cg_values / 100) * 6.0  # Range: 2-8% based on score
             converted_df['10 yr Avg. Annual Growth'] = estimated_growth
-            growth_rate_found = True
-            print(f"✅ Using 'Capital Growth' score for growth rate estimation")
-
-        # Try other growth-related columns
-        else:
-            for col_name in ['GRC Index', 'PΔ5Y', 'PΔ3Y']:
-                if col_name in df.columns:
-                    if 'PΔ' in col_name:
-                        # Extract years from column name and convert appropriately
-                        years = int(col_name.replace('PΔ', '').replace('Y', ''))
-                        growth_values = pd.to_numeric(df[col_name], errors='coerce')
-                        annual_growth = ((1 + growth_values) ** (1/years) - 1) * 100
-                        converted_df['10 yr Avg. Annual Growth'] = annual_growth
-                    else:
-                        converted_df['10 yr Avg. Annual Growth'] = pd.to_numeric(df[col_name], errors='coerce')
-                    growth_rate_found = True
-                    print(f"✅ Using '{col_name}' for growth rate")
-                    break
+            if verbose:
+                print(f"✅ Using 'Capital Growth' score for growth rate estimation")
+
+        elif growth_column == 'GRC Index':
+            converted_df['10 yr Avg. Annual Growth'] = numeric['GRC Index']
+            if verbose:
+                print(f"✅ Using 'GRC Index' for growth rate")
+
+        elif growth_column is not None:
+            # PΔnY: cumulative n-year price delta, converted to an annual rate
+            years = int(growth_column.replace('PΔ', '').replace('Y', ''))
+            growth_values = numeric[growth_column].to_numpy(dtype=np.float64)
+            converted_df['10 yr Avg. Annual Growth'] = annualize(growth_values, years)
+            if verbose:
+                print(f"✅ Using '{growth_column}' for growth rate (converted to annual %)")
 
         # If no growth rate column found, estimate based on price and yield
         if not growth_rate_found:
-            print("⚠️  No growth rate column found, estimating...")
+            if verbose:
+                print("⚠️  No growth rate column found, estimating...")
             # Estimate growth based on yield and market characteristics
             if 'Rental Yield on Houses' in converted_df.columns:
                 # Higher yield often correlates with higher growth potential in regional areas
                 base_growth = 4.0  # Base growth rate
-                yield_bonus = (converted_df['Rental Yield on Houses'] - 3.0) * 0.5
-                converted_df['10 yr Avg. Annual Growth'] = np.maximum(2.0, base_growth + yield_bonus)
+                yield_bonus = (converted_df['Rental Yield on Houses'].to_numpy() - 3.0) * 0.5
+                converted_df['10 yr Avg. Annual Growth'] = np.fmax(2.0, base_growth + yield_bonus)
             else:
                 converted_df['10 yr Avg. Annual Growth'] = 5.0  # Default estimate
 
         # Clean the data
-        print("🧹 Cleaning data...")
+        if verbose:
+            print("🧹 Cleaning data...")
 
-        # Remove rows with missing critical data
+        # Build one row mask and materialize the filtered frame once
         critical_columns = ['Suburb', 'State', 'Median Price']
-        converted_df = converted_df.dropna(subset=critical_columns)
 
-        # Remove duplicates
-        converted_df = converted_df.drop_duplicates(subset=['Suburb', 'State'])
+        # Rows with all critical data
+        keep = converted_df[critical_columns].notna().all(axis=1).to_numpy(copy=True)
+
+        # Remove duplicates; the first complete row of each suburb/state pair wins,
+        # by packing both factorized codes into one int64 key
+        suburb_codes, _ = pd.factorize(converted_df['Suburb'].to_numpy()[keep])
+        state_codes, _ = pd.factorize(converted_df['State'].to_numpy()[keep])
+        pair_key = (suburb_codes.astype(np.int64) << 32) | state_codes
+        duplicate = np.zeros(len(converted_df), dtype=bool)
+        duplicate[keep] = pd.Series(pair_key).duplicated().to_numpy()
+        keep &= ~duplicate
 
         # Filter out rows with unrealistic data
-        converted_df = converted_df[
-            (converted_df['Median Price'] >= 100000) &
-            (converted_df['Median Price'] <= 10000000)
-        ]
+        price = converted_df['Median Price'].to_numpy()
+        keep &= (price >= 100000) & (price <= 10000000)
 
         if 'Rental Yield on Houses' in converted_df.columns:
-            converted_df = converted_df[
-                (converted_df['Rental Yield on Houses'] >= 0) &
-                (converted_df['Rental Yield on Houses'] <= 20)
-            ]
+            rental_yield = converted_df['Rental Yield on Houses'].to_numpy()
+            keep &= (rental_yield >= 0) & (rental_yield <= 20)
 
-        print(f"✅ Cleaned data: {len(converted_df)} valid suburbs")
+        converted_df = converted_df[keep]
 
-        # Show sample of converted data
-        print("\n📊 SAMPLE CONVERTED DATA:")
-        print(converted_df.head().to_string())
+        if verbose:
+            print(f"✅ Cleaned data: {len(converted_df)} valid suburbs")
 
-        print(f"\n📈 DATA SUMMARY:")
-        print(f"Suburbs: {len(converted_df)}")
-        print(f"States: {converted_df['State'].unique()}")
-        print(f"Price range: ${converted_df['Median Price'].min():,.0f} - ${converted_df['Median Price'].max():,.0f}")
-        if 'Rental Yield on Houses' in converted_df.columns:
-            print(f"Yield range: {converted_df['Rental Yield on Houses'].min():.1f}% - {converted_df['Rental Yield on Houses'].max():.1f}%")
+            # Show sample of converted data
+            print("\n📊 SAMPLE CONVERTED DATA:")
+            print(converted_df.head().to_string())
+
+            print(f"\n📈 DATA SUMMARY:")
+            print(f"Suburbs: {len(converted_df)}")
+            print(f"States: {converted_df['State'].unique()}")
+            # The filter above leaves no NaN in price or yield, so plain array reductions suffice
+            if len(converted_df):
+                price = converted_df['Median Price'].to_numpy()
+                print(f"Price range: ${np.min(price):,.0f} - ${np.max(price):,.0f}")
+                if 'Rental Yield on Houses' in converted_df.columns:
+                    rental_yield = converted_df['Rental Yield on Houses'].to_numpy()
+                    print(f"Yield range: {np.min(rental_yield):.1f}% - {np.max(rental_yield):.1f}%")
 
         # Save converted file
         if output_file is None:
             output_file = input_file.replace('.xlsx', '_converted.csv')
 
-        converted_df.to_csv(output_file, index=False)
-        print(f"\n💾 Saved converted data to: {output_file}")
+        write_csv(converted_df, output_file)
+        if verbose:
+            print(f"\n💾 Saved converted data to: {output_file}")
 
         return converted_df, output_file
 